@@ -0,0 +1,166 @@
+import hmac
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from flask import Flask, jsonify, request
+from flask_cors import CORS
+from functions.company_scrape import scrape_company
+from functions.result_cache import ResultCache
+from functions.warm_pool import WarmPool
+
+# -------------------- CONFIG --------------------
+# Logged-in browsers kept warm by this process
+api_workers = int(os.getenv("REPVUE_API_WORKERS", "2"))
+
+# How long a scraped company is served from memory
+cache_ttl = float(os.getenv("REPVUE_CACHE_TTL", "3600"))
+
+# GET /companies/<slug> waits this long for a fresh scrape before answering 202 (?wait= overrides, up to max_wait)
+default_wait = float(os.getenv("REPVUE_API_WAIT", "60"))
+max_wait = float(os.getenv("REPVUE_API_MAX_WAIT", "300"))
+
+# Most companies accepted by one POST /jobs
+max_job_size = int(os.getenv("REPVUE_API_MAX_JOB", "500"))
+
+# Every scrape runs on the logged-in RepVue account, so requests must carry
+# "Authorization: Bearer <token>" (/health excepted). Required unless the API only listens on localhost.
+api_token = os.getenv("REPVUE_API_TOKEN")
+
+# Comma-separated origins allowed to call the API from a browser (none by default)
+cors_origins = [o.strip() for o in os.getenv("REPVUE_API_CORS_ORIGINS", "").split(",") if o.strip()]
+
+# Interface to listen on; set 0.0.0.0 (with a token) to serve other machines
+api_host = os.getenv("REPVUE_API_HOST", "127.0.0.1")
+
+# refresh=1 only forces a new scrape once the cached result is at least this old
+min_refresh_age = float(os.getenv("REPVUE_API_MIN_REFRESH", "600"))
+
+HTTP_STATUS = {"OK": 200, "Unchanged": 200, "Not Found": 404}
+
+
+def _key(company=None, slug=None):
+    return f"slug:{slug.lower()}" if slug else f"name:{' '.join(company.split()).lower()}"
+
+
+def _work(svc, item):
+    company, slug = item
+    return scrape_company(svc, company, slug=slug)
+
+
+def create_app(pool=None, cache=None, token=None):
+    """
+    Flask app over a WarmPool of logged-in RepVueService workers (started here unless
+    one is passed in). Run it in ONE process so every request sees the same pool and
+    cache, e.g.  REPVUE_API_TOKEN=... gunicorn -w 1 --threads 16 -b 127.0.0.1:8000 'api:create_app()'
+    `token` defaults to REPVUE_API_TOKEN; without one the API has no auth.
+    """
+    token = token or api_token
+    if pool is None:
+        from scraper_multiple_companies import start_worker
+        pool = WarmPool(start_worker, _work, workers=api_workers).start()
+    if cache is None:
+        cache = ResultCache(ttl=cache_ttl)
+    jobs = {}     # job_id -> {"created", "items": {company: key}}
+    jobs_lock = threading.Lock()
+
+    app = Flask(__name__)
+    if cors_origins:
+        CORS(app, origins=cors_origins)
+
+    @app.before_request
+    def _authorize():
+        if token is None or request.path == "/health":
+            return None
+        sent = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(sent.encode(), token.encode()):
+            return jsonify(error="missing or invalid token"), 401
+        return None
+
+    def submit(company=None, slug=None, refresh=False):
+        key = _key(company, slug)
+        if refresh:
+            # a recent result is served anyway, so callers can't keep forcing scrapes
+            _, age = cache.get(key)
+            refresh = age is None or age >= min_refresh_age
+        fut, source = cache.get_or_submit(key, lambda: pool.submit((company or slug, slug)), refresh=refresh)
+        if source == "scrape" and not slug:
+            fut.add_done_callback(_alias_slug)
+        return fut, source
+
+    def _alias_slug(fut):
+        # a search by name also answers later lookups by slug
+        res = fut.result()
+        if res.get("status") == "OK" and res.get("slug"):
+            cache.put(_key(slug=res["slug"]), res)
+
+    def _prune_jobs():
+        cutoff = time.time() - cache_ttl
+        for job_id in [j for j, job in jobs.items() if job["created"] < cutoff]:
+            del jobs[job_id]
+
+    @app.post("/jobs")
+    def create_job():
+        body = request.get_json(silent=True) or {}
+        companies = body.get("companies")
+        if not isinstance(companies, list) or not all(isinstance(c, str) and c.strip() for c in companies):
+            return jsonify(error="body must be {\"companies\": [\"name\", ...]}"), 400
+        if len(companies) > max_job_size:
+            return jsonify(error=f"at most {max_job_size} companies per job"), 400
+
+        refresh = bool(body.get("refresh"))
+        items = {}
+        for c in dict.fromkeys(c.strip() for c in companies):
+            submit(company=c, refresh=refresh)
+            items[c] = _key(company=c)
+        job_id = uuid.uuid4().hex
+        with jobs_lock:
+            _prune_jobs()
+            jobs[job_id] = {"created": time.time(), "items": items}
+        return jsonify(job_id=job_id, companies=len(items), status_url=f"/jobs/{job_id}"), 202
+
+    @app.get("/jobs/<job_id>")
+    def get_job(job_id):
+        with jobs_lock:
+            job = jobs.get(job_id)
+        if job is None:
+            return jsonify(error="unknown job"), 404
+        results, pending = {}, 0
+        for company, key in job["items"].items():
+            res, _ = cache.get(key)
+            if res is None:
+                # still running, or expired from the cache: (re)submit so it completes
+                fut, _ = submit(company=company)
+                res = fut.result() if fut.done() else None
+            if res is None:
+                pending += 1
+                results[company] = {"company": company, "status": "Pending"}
+            else:
+                results[company] = res
+        return jsonify(job_id=job_id, done=pending == 0, pending=pending, results=results)
+
+    @app.get("/companies/<slug>")
+    def get_company(slug):
+        # a non-numeric ?wait= falls back to the default instead of failing the request
+        wait = max(0.0, min(request.args.get("wait", default_wait, type=float), max_wait))
+        fut, source = submit(slug=slug, refresh=request.args.get("refresh") == "1")
+        try:
+            res = fut.result(timeout=wait)
+        except FutureTimeout:
+            return jsonify(slug=slug, status="Pending", retry_after=5), 202
+        _, age = cache.get(_key(slug=slug))
+        return jsonify({**res, "source": source, "age_seconds": age}), HTTP_STATUS.get(res.get("status"), 502)
+
+    @app.get("/health")
+    def health():
+        return jsonify(workers_ready=sum(pool.ready.values()), workers=pool.workers, queued=pool.pending(),
+                       cached=len(cache), cache=cache.stats)
+
+    return app
+
+
+if __name__ == "__main__":
+    if not api_token and api_host not in ("127.0.0.1", "localhost", "::1"):
+        raise SystemExit(f"REPVUE_API_TOKEN is required to listen on {api_host}")
+    create_app().run(host=api_host, port=int(os.getenv("PORT", "8000")), threaded=True)
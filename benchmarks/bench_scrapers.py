@@ -0,0 +1,224 @@
+"""
+Offline scraper benchmarks over archived RepVue pages.
+
+Fixtures:  benchmarks/fixtures/<slug>/overview.html and salaries.html
+           (record them with --capture SLUG [SLUG ...], which needs REPVUE_EMAIL/REPVUE_PASS;
+           scripts are stripped and a CSP meta tag keeps the page from loading anything remote)
+Serving:   a local HTTP server maps /companies/<slug>[/salaries] to those files, and
+           headless Chrome loads them, so no request reaches repvue.com.
+
+    python -m benchmarks.bench_scrapers                    # run, compare with baseline.json
+    python -m benchmarks.bench_scrapers --save-baseline    # run and store as new baseline
+    python -m benchmarks.bench_scrapers -n 50 --only general_info
+
+Per scraper: WebDriver round trips per call, p50/p95 latency, Python peak memory
+(tracemalloc) and Chrome process-tree RSS. A scraper regresses when p95 or
+round trips exceed the baseline by more than --tolerance. A scraper that times out on
+a fixture (e.g. a page without a performance table) is counted under `errors` and the
+run goes on.
+"""
+import argparse, json, os, statistics, sys, threading, tracemalloc
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functions.make_driver import make_driver
+from functions.general_info import scrape_general_info, scrape_general_info_dom
+from functions.performance_info import scrape_performance_table, scrape_performance_table_dom
+from functions.salaries_table import scrape_salaries_table
+from functions.incremental_list import iter_salaries
+from functions.instrumentation import Tracer
+from functions.driver_lifecycle import process_tree_rss_mb, quit_driver
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+BASELINE = os.path.join(HERE, "baseline.json")
+
+def iter_salaries_all(driver, wait):
+    """The production salaries path (incremental list reader), from a fresh page each call."""
+    driver.execute_script("document.querySelectorAll('[data-rv-seen]').forEach(e => e.removeAttribute('data-rv-seen'));")
+    return list(iter_salaries(driver))
+
+
+# name -> (fixture page, callable(driver, wait))
+SCRAPERS = {
+    "general_info": ("overview", scrape_general_info),
+    "general_info_dom": ("overview", scrape_general_info_dom),
+    "performance": ("overview", scrape_performance_table),
+    "performance_dom": ("overview", scrape_performance_table_dom),
+    "salaries": ("salaries", scrape_salaries_table),
+    "salaries_incremental": ("salaries", iter_salaries_all),
+}
+
+# Saved instead of the live outerHTML: no <script>/preload tags, and a CSP that only
+# allows the fixture server, so replaying a page can't call repvue.com
+SNAPSHOT_JS = r"""
+const root = document.documentElement.cloneNode(true);
+root.querySelectorAll("script, noscript, iframe, link[rel='preload'], link[rel='modulepreload'], link[rel='prefetch']")
+  .forEach(el => el.remove());
+const csp = document.createElement("meta");
+csp.setAttribute("http-equiv", "Content-Security-Policy");
+csp.setAttribute("content", "default-src 'self' data: 'unsafe-inline'");
+const head = root.querySelector("head");
+if (head) head.prepend(csp);
+return "<!DOCTYPE html>" + root.outerHTML;
+"""
+
+
+# -------------------- fixture server --------------------
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        page = None
+        if len(parts) >= 2 and parts[0] == "companies":
+            name = "salaries.html" if parts[2:3] == ["salaries"] else "overview.html"
+            page = os.path.join(FIXTURES, parts[1], name)
+        if not page or not os.path.isfile(page):
+            self.send_error(404)
+            return
+        with open(page, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_fixtures():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# -------------------- measurement --------------------
+def pct(values, q):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def bench(driver, base_url, slugs, names, iterations):
+    wait = WebDriverWait(driver, 10)
+    tracer = Tracer()
+    tracer.instrument(driver)
+    results = {}
+    for name in names:
+        page, fn = SCRAPERS[name]
+        times, trips, errors = [], [], 0
+        tracemalloc.start()
+        for slug in slugs:
+            driver.get(f"{base_url}/companies/{slug}" + ("/salaries" if page == "salaries" else ""))
+            try:
+                fn(driver, wait)  # warm-up, not timed
+            except TimeoutException:
+                errors += 1
+                print(f"{name}: timed out on fixture {slug}, skipped")
+                continue
+            for _ in range(iterations):
+                with tracer.span(name) as s:
+                    fn(driver, wait)
+                times.append(s["seconds"] * 1000)
+                trips.append(s["commands"])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {
+            "calls": len(times),
+            "errors": errors,
+            "round_trips": round(statistics.mean(trips), 1) if trips else None,
+            "p50_ms": round(pct(times, 50), 1) if times else None,
+            "p95_ms": round(pct(times, 95), 1) if times else None,
+            "py_peak_kb": round(peak / 1024, 1),
+            "chrome_rss_mb": process_tree_rss_mb(driver),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Returns list of regression messages."""
+    bad = []
+    for name, r in results.items():
+        b = baseline.get(name)
+        if not b or not b.get("calls"):
+            continue
+        if not r["calls"]:
+            bad.append(f"{name}: no successful calls ({r['errors']} fixture(s) timed out)")
+            continue
+        if r["p95_ms"] > b["p95_ms"] * (1 + tolerance):
+            bad.append(f"{name}: p95 {b['p95_ms']} -> {r['p95_ms']} ms")
+        if r["round_trips"] > b["round_trips"] * (1 + tolerance):
+            bad.append(f"{name}: round trips {b['round_trips']} -> {r['round_trips']}")
+    return bad
+
+
+# -------------------- fixture capture --------------------
+def capture(slugs):
+    from dotenv import load_dotenv
+    from service import RepVueService
+
+    load_dotenv()
+    with RepVueService.create() as svc:
+        svc.ensure_login(os.getenv("REPVUE_EMAIL"), os.getenv("REPVUE_PASS"))
+        for slug in slugs:
+            os.makedirs(os.path.join(FIXTURES, slug), exist_ok=True)
+            for page, signal, suffix in (("overview", "performance", ""), ("salaries", "salaries", "/salaries")):
+                svc.driver.get(f"https://www.repvue.com/companies/{slug}{suffix}")
+                svc.ready(signal)
+                with open(os.path.join(FIXTURES, slug, f"{page}.html"), "w", encoding="utf-8") as f:
+                    f.write(svc.driver.execute_script(SNAPSHOT_JS))
+            print(f"captured {slug}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", "--iterations", type=int, default=20)
+    ap.add_argument("--only", nargs="*", choices=sorted(SCRAPERS), help="subset of scrapers")
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    ap.add_argument("--capture", nargs="+", metavar="SLUG", help="record fixtures from the live site and exit")
+    args = ap.parse_args()
+
+    if args.capture:
+        capture(args.capture)
+        return 0
+
+    slugs = sorted(d for d in os.listdir(FIXTURES) if os.path.isdir(os.path.join(FIXTURES, d)))
+    if not slugs:
+        print(f"No fixtures in {FIXTURES}; record some with --capture SLUG")
+        return 2
+
+    server, base_url = serve_fixtures()
+    driver = make_driver()
+    try:
+        results = bench(driver, base_url, slugs, args.only or list(SCRAPERS), args.iterations)
+    finally:
+        quit_driver(driver)
+        server.shutdown()
+
+    print(f"{'scraper':20} {'calls':>6} {'errors':>6} {'trips':>6} {'p50 ms':>8} {'p95 ms':>8} {'py KiB':>8} {'chrome MB':>10}")
+    for name, r in results.items():
+        print(f"{name:20} {r['calls']:>6} {r['errors']:>6} {str(r['round_trips']):>6} {str(r['p50_ms']):>8} "
+              f"{str(r['p95_ms']):>8} {r['py_peak_kb']:>8} {str(r['chrome_rss_mb']):>10}")
+
+    if args.save_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+        print(f"\nBaseline saved to {BASELINE}")
+        return 0
+
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for msg in regressions:
+            print(f"REGRESSION {msg}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
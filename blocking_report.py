@@ -0,0 +1,39 @@
+import os, sys
+from dotenv import load_dotenv
+from service import RepVueService
+from functions.request_blocking import BlockProfile, savings
+
+load_dotenv()
+
+email_id = os.getenv("REPVUE_EMAIL")
+password = os.getenv("REPVUE_PASS")
+
+# Usage: python blocking_report.py [slug ...]
+# Loads each company's overview and salaries page once without and once with the
+# default BlockProfile and prints requests/bytes saved per page.
+slugs = sys.argv[1:] or ["Salesforce"]
+
+
+def measure(block_profile):
+    # capture_network=True keeps the performance log on for the unblocked baseline too
+    # (otherwise page_weight() has nothing to read and reports zeros)
+    with RepVueService.create(block_profile=block_profile, capture_network=True) as svc:
+        svc.ensure_login(email_id, password)
+        svc.page_weight()  # drop login traffic
+        out = {}
+        for slug in slugs:
+            for page in ("", "salaries"):
+                svc.driver.get(f"https://www.repvue.com/companies/{slug}/{page}".rstrip("/"))
+                svc.ready("network_idle", timeout=30)
+                out[f"{slug}/{page or 'overview'}"] = svc.page_weight()
+        return out
+
+
+if __name__ == "__main__":
+    base = measure(None)
+    blocked = measure(BlockProfile())
+    for page in base:
+        s = savings(base[page], blocked[page])
+        print(f"{page:40} {base[page]['requests']:>4} -> {blocked[page]['requests']:<4} req  "
+              f"{base[page]['bytes'] / 1024:>8.0f} -> {blocked[page]['bytes'] / 1024:<8.0f} KiB  "
+              f"saved {s['bytes_saved_pct']}%  blocked {blocked[page]['blocked_by_type']}")
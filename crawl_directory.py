@@ -0,0 +1,23 @@
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from service import RepVueService
+from functions.company_directory import DEFAULT_CATALOG_FILE, write_catalog
+
+load_dotenv()
+
+email_id = os.getenv("REPVUE_EMAIL")
+password = os.getenv("REPVUE_PASS")
+
+# Usage: python crawl_directory.py [catalog.jsonl|catalog.csv]
+# Walks https://www.repvue.com/companies to the end, writes one line per company
+# (name, slug, url, summary fields) and seeds the slug cache, so
+# `scraper_multiple_companies.py --catalog <file>` runs without a single search.
+if __name__ == "__main__":
+    catalog_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CATALOG_FILE
+    start = time.time()
+    with RepVueService.create() as svc:
+        svc.ensure_login(email_id, password)
+        n = write_catalog(svc.directory(), catalog_file, slug_cache=svc.slug_cache)
+    print(f"✅ Cataloged {n} companies to {catalog_file} in {round(time.time() - start, 1)}s")
@@ -0,0 +1,9 @@
+import sys
+from functions.sinks import finalize_excel
+
+# Usage: python finalize_excel.py [sink_dir] [output.xlsx]
+if __name__ == "__main__":
+    sink_dir = sys.argv[1] if len(sys.argv) > 1 else "repvue_out"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else "repvue_data.xlsx"
+    n = finalize_excel(sink_dir, output_file)
+    print(f"Wrote {n} companies from {sink_dir}/ to {output_file}")
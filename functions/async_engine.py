@@ -0,0 +1,79 @@
+"""
+asyncio engine for the HTTP fast path: fetch overview + /salaries pages for many
+slugs concurrently over one httpx.AsyncClient and yield results as they complete.
+
+    async for res in scrape_many(slugs, cookies, headers, concurrency=50):
+        ...
+
+Parsing (regex + json + mapping) runs in an executor so it never blocks the loop;
+pass a ProcessPoolExecutor to spread it over cores.
+"""
+import asyncio, importlib.util
+from contextlib import nullcontext
+import httpx
+
+from functions.http_client import BASE_URL, embedded_payloads
+from functions.network_capture import map_general_info, map_performance, map_salaries
+from functions.general_info import REQUIRED_FIELDS
+
+def _parse_company(slug, overview_html, salaries_html):
+    """CPU part, top-level so it can run in a process pool."""
+    overview = embedded_payloads(overview_html) if overview_html else []
+    salaries_page = embedded_payloads(salaries_html) if salaries_html else []
+    out = {
+        "info": map_general_info(overview, slug),
+        "perf": map_performance(overview, slug),
+        "salaries": map_salaries(salaries_page, slug),
+    }
+    # a partial overview is not trusted: it goes through Selenium like a missing one
+    out["missing"] = [k for k, v in out.items()
+                      if v is None or (k == "info" and any(v.get(f) is None for f in REQUIRED_FIELDS))]
+    return out
+
+async def _get(client, url, limiter=None):
+    async with (limiter.limit_async("http") if limiter is not None else nullcontext({})) as load:
+        r = await client.get(url)
+        load["status"] = r.status_code
+    if r.status_code != 200 or "/login" in str(r.url):
+        return None
+    return r.text
+
+async def scrape_many(slugs, cookies, headers=None, concurrency=20, per_host=10,
+                      http2=True, timeout=20, executor=None, limiter=None):
+    """
+    Async generator of {slug, info, perf, salaries, missing, error} in completion order.
+    `missing` lists parts the pages didn't carry (scrape those with Selenium afterwards).
+
+    concurrency: companies in flight at once (semaphore)
+    per_host:    connection pool size; everything goes to www.repvue.com
+    http2:       used when the optional `h2` package is installed
+    limiter:     optional shared RateLimiter; every GET waits for a token and reports 429/503
+    """
+    limits = httpx.Limits(max_connections=per_host, max_keepalive_connections=per_host)
+    use_h2 = http2 and importlib.util.find_spec("h2") is not None
+    sem = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    async with httpx.AsyncClient(base_url=BASE_URL, cookies=cookies, headers=headers, limits=limits,
+                                 http2=use_h2, timeout=timeout, follow_redirects=True) as client:
+
+        async def one(slug):
+            async with sem:
+                try:
+                    overview_html, salaries_html = await asyncio.gather(
+                        _get(client, f"/companies/{slug}", limiter),
+                        _get(client, f"/companies/{slug}/salaries", limiter),
+                    )
+                    parsed = await loop.run_in_executor(executor, _parse_company, slug, overview_html, salaries_html)
+                    return {"slug": slug, **parsed, "error": None}
+                except (httpx.HTTPError, asyncio.TimeoutError) as e:
+                    return {"slug": slug, "info": None, "perf": None, "salaries": None,
+                            "missing": ["info", "perf", "salaries"], "error": repr(e)}
+
+        tasks = [asyncio.ensure_future(one(s)) for s in slugs]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for t in tasks:
+                t.cancel()
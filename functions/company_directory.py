@@ -0,0 +1,102 @@
+"""
+Bulk enumeration of RepVue's company directory (https://www.repvue.com/companies).
+
+The listing is walked with the same incremental loop as salaries/reviews
+(functions.incremental_list): a one-shot script returns the company cards it
+has not returned yet, then the next page / "load more" / infinite scroll is triggered.
+Entries are streamed to a JSONL catalog and seeded into the slug cache, so a
+run over catalog names never opens the search dialog.
+"""
+import csv, json, os
+
+from functions.incremental_list import iter_list_rows
+from functions.http_client import BASE_URL
+
+DEFAULT_CATALOG_FILE = os.getenv("REPVUE_CATALOG", "repvue_catalog.jsonl")
+
+# One entry per company card: {slug, name, url, repvue_score, star_rating, ratings_count, industry, summary}.
+# Honours arguments[0] = incremental like SALARIES_JS (cards are marked with data-rv-seen).
+DIRECTORY_JS = r"""
+const incremental = !!arguments[0];
+const norm = s => (s||"").replace(/\s+/g," ").trim();
+const slugOf = a => {
+  const m = (a.getAttribute("href") || "").match(/^(?:https?:\/\/[^\/]+)?\/companies\/([^\/?#]+)\/?(?:[?#].*)?$/);
+  return m ? decodeURIComponent(m[1]) : null;
+};
+const links = [...document.querySelectorAll("a[href*='/companies/']")]
+  .filter(a => slugOf(a) && !a.closest("nav, header, footer, [role='dialog']"))
+  .filter(a => !(incremental && a.closest("[data-rv-seen]")));
+
+// card = the largest ancestor that still links to just this one company
+const cards = new Map();
+for (const a of links) {
+  const slug = slugOf(a);
+  let card = a;
+  while (card.parentElement && card.parentElement !== document.body) {
+    const others = [...card.parentElement.querySelectorAll("a[href*='/companies/']")]
+      .some(x => slugOf(x) && slugOf(x) !== slug);
+    if (others) break;
+    card = card.parentElement;
+  }
+  if (!cards.has(slug)) cards.set(slug, {card, a});
+}
+
+const num = (re, s) => { const m = s.match(re); return m ? parseFloat(m[1].replace(/,/g, "")) : null; };
+const out = [];
+for (const [slug, {card, a}] of cards) {
+  if (incremental && card.dataset.rvSeen) continue;
+  if (incremental) card.dataset.rvSeen = "1";
+  const text = norm(card.innerText || card.textContent);
+  const heading = card.querySelector("h1,h2,h3,h4,h5,h6,[class*='name'],[class*='Name']");
+  const img = card.querySelector("img[alt]");
+  const industry = card.querySelector("[class*='industry'],[class*='Industry']");
+  out.push({
+    slug,
+    name: norm(heading ? heading.textContent : "") || norm(a.textContent) || (img ? norm(img.alt) : "") || slug,
+    url: new URL(a.getAttribute("href"), location.origin).href,
+    repvue_score: num(/RepVue Score\D{0,10}(\d+(?:\.\d+)?)/i, text),
+    star_rating: num(/(\d\.\d)\s*(?:★|stars?|\/\s*5|out of 5)/i, text),
+    ratings_count: num(/([\d,]+)\s+(?:employee\s+)?ratings?/i, text),
+    industry: industry ? norm(industry.textContent) : null,
+    summary: text.slice(0, 300),
+  });
+}
+return out;
+"""
+
+def crawl_directory(driver, url=f"{BASE_URL}/companies", **kwargs):
+    """Generator of directory entries (DIRECTORY_JS schema), deduplicated by slug."""
+    if driver.current_url.split("?")[0].rstrip("/") != url.rstrip("/"):
+        driver.get(url)
+    kwargs.setdefault("scroll", True)
+    return iter_list_rows(driver, DIRECTORY_JS, key="slug", **kwargs)
+
+def write_catalog(entries, path=DEFAULT_CATALOG_FILE, slug_cache=None):
+    """
+    Stream entries to a JSONL catalog (or .csv), then seed `slug_cache` with
+    every name -> slug in one write. Returns the number written.
+    """
+    n, slugs = 0, {}
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = None
+        for e in entries:
+            if path.endswith(".csv"):
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(e), extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(e)
+            else:
+                f.write(json.dumps(e, ensure_ascii=False) + "\n")
+            if e.get("name"):
+                slugs[e["name"]] = e["slug"]
+            n += 1
+    if slug_cache is not None:
+        slug_cache.put_many(slugs)
+    return n
+
+def load_catalog(path=DEFAULT_CATALOG_FILE):
+    """Catalog entries as a list of dicts (JSONL or CSV)."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            return list(csv.DictReader(f))
+        return [json.loads(line) for line in f if line.strip()]
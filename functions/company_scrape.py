@@ -0,0 +1,186 @@
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from functions.exceptions import CompanyNotFound
+from functions.fingerprint import fingerprint
+
+def scrape_company(svc, company, fingerprints=None, force=False, slug=None, on_rows=None):
+    """
+    Search one company and run all scrapers on it with an already logged-in service.
+    Always returns a dict with `company` and `status`; never raises for per-company
+    failures so a worker can move on to the next name.
+
+    slug: if already known, the company page is opened directly (no search).
+
+    fingerprints: optional FingerprintStore. general_info is scraped first as a cheap
+                  check; if it hashes the same as last run the performance/salaries
+                  pass is skipped and status is "Unchanged". force=True always scrapes.
+
+    on_rows: optional sink.write_rows. Salary and review rows are then handed over in
+             batches while the lists load instead of being returned; the result keeps
+             their counts under "streamed" and the `scraped_at` the rows were written with.
+    """
+    svc.maybe_recycle()
+    with svc.span("company", company=company) as s:
+        res = _scrape_company(svc, company, fingerprints, force, slug, on_rows)
+        if s is not None:
+            s["attrs"]["status"] = res["status"]
+
+    if svc.guard is not None:
+        reason = svc.guard.tripped
+        if reason:
+            # The watchdog killed Chrome mid-scrape: fresh driver, company goes back in the queue
+            svc.recycle(f"resource guard: {reason}")
+            return {"company": company, "status": "Requeue", "error": f"resource limit: {reason}",
+                    "seconds": res.get("seconds")}
+        res.update(svc.guard.take_usage())
+    return res
+
+def _complete(info, perf, salaries):
+    """
+    Only a pass with every page filled is fingerprinted: the scrapers return empty
+    results on errors, and hashing those would mark broken data "Unchanged" for good.
+    """
+    return bool(info and any(v is not None for v in info.values()) and perf and salaries)
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+def _stream(rows, table, meta, on_rows, details=None, batch=50):
+    """
+    Pass `rows` to on_rows(table, meta, batch) `batch` at a time, running `details`
+    on each batch first. Returns the rows' fingerprints (for the change check).
+    """
+    hashes = []
+    for chunk in _batches(rows, batch):
+        if details is not None:
+            details(chunk)
+        on_rows(table, meta, chunk)
+        hashes += [fingerprint(r) for r in chunk]
+    return hashes
+
+def _scrape_company(svc, company, fingerprints, force, slug=None, on_rows=None):
+    start = time.time()
+    scraped_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    waited = svc.wait_seconds
+    if svc.fast_path:
+        return _scrape_company_fast(svc, company, start, waited, fingerprints, slug)
+    try:
+        url = svc.open_company(slug) if slug else svc.search(company)
+    except CompanyNotFound:
+        return {"company": company, "status": "Not Found", "seconds": round(time.time() - start, 2)}
+    except Exception as e:
+        return {"company": company, "status": "Failed", "error": repr(e),
+                "seconds": round(time.time() - start, 2)}
+
+    try:
+        # Return as soon as the overview data is rendered
+        svc.ready("general_info", "performance")
+
+        info = svc.general_info() or {}
+        slug = svc.company_slug()
+
+        # Cheap check: nothing moved in the headline numbers -> skip the rest
+        if fingerprints is not None and slug and not force and fingerprints.unchanged(slug, "summary", info):
+            return {"company": company, "status": "Unchanged", "url": url, "slug": slug, "info": info,
+                    "seconds": round(time.time() - start, 2),
+                    "wait_seconds": round(svc.wait_seconds - waited, 2)}
+
+        perf = svc.performance() or []
+        weights = {"overview": svc.page_weight()} if svc.records_network else {}
+
+        meta = {"company": company, "slug": slug, "scraped_at": scraped_at}
+        streamed = {}
+        salaries = []
+        if slug:
+            svc.go("salaries", slug)
+            svc.ready("salaries")
+            details = svc.salary_details if svc.role_detail_tabs else None
+            if on_rows is not None and svc.paginate_lists:
+                with svc.span("salaries"):
+                    hashes = _stream(svc.iter_salaries(), "salaries", meta, on_rows, details)
+                streamed["salaries"] = len(hashes)
+                if svc.records_network:
+                    weights["salaries"] = svc.page_weight()
+            else:
+                salaries = svc.salaries() or []
+                if svc.records_network:
+                    weights["salaries"] = svc.page_weight()
+                if details is not None and salaries:
+                    details(salaries)
+
+        reviews = []
+        if slug and svc.scrape_reviews:
+            svc.go("reviews", slug)
+            svc.ready("network_idle", timeout=10)
+            with svc.span("reviews"):
+                if on_rows is not None:
+                    streamed["reviews"] = len(_stream(svc.iter_reviews(), "reviews", meta, on_rows))
+                else:
+                    reviews = list(svc.iter_reviews())
+    except Exception as e:
+        return {"company": company, "status": "Failed", "url": url, "error": repr(e),
+                "seconds": round(time.time() - start, 2)}
+
+    changed = None
+    # streamed salaries are compared by their row fingerprints
+    salary_check = hashes if "salaries" in streamed else salaries
+    if fingerprints is not None and slug and _complete(info, perf, salary_check):
+        changed = fingerprints.update(slug, summary=info, info=info, perf=perf, salaries=salary_check)
+
+    return {
+        "company": company,
+        "status": "OK",
+        "url": url,
+        "slug": slug,
+        "changed": changed,
+        "info": info,
+        "perf": perf,
+        "salaries": salaries,
+        "reviews": reviews,
+        "streamed": streamed,
+        "scraped_at": scraped_at,
+        "seconds": round(time.time() - start, 2),
+        "wait_seconds": round(svc.wait_seconds - waited, 2),
+        "page_weight": weights,
+    }
+
+def _scrape_company_fast(svc, company, start, waited, fingerprints=None, slug=None):
+    """
+    HTTP-first variant of scrape_company (RepVueService.fast_path); same result shape.
+    Every page is fetched anyway, so fingerprints only record what changed.
+    """
+    try:
+        slug = slug or svc.resolve_slug(company)
+    except CompanyNotFound:
+        return {"company": company, "status": "Not Found", "seconds": round(time.time() - start, 2)}
+    except Exception as e:
+        return {"company": company, "status": "Failed", "error": repr(e),
+                "seconds": round(time.time() - start, 2)}
+
+    try:
+        data = svc.scrape_fast(slug)
+    except Exception as e:
+        return {"company": company, "status": "Failed", "slug": slug, "error": repr(e),
+                "seconds": round(time.time() - start, 2)}
+
+    changed = None
+    if fingerprints is not None and _complete(data["info"], data["perf"], data["salaries"]):
+        changed = fingerprints.update(slug, summary=data["info"] or {}, info=data["info"] or {},
+                                      perf=data["perf"] or [], salaries=data["salaries"] or [])
+
+    return {
+        "company": company,
+        "status": "OK",
+        "changed": changed,
+        "url": f"https://www.repvue.com/companies/{slug}",
+        "slug": slug,
+        "info": data["info"] or {},
+        "perf": data["perf"] or [],
+        "salaries": data["salaries"] or [],
+        "fast": data["fast"],
+        "seconds": round(time.time() - start, 2),
+        "wait_seconds": round(svc.wait_seconds - waited, 2),
+    }
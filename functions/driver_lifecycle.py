@@ -0,0 +1,33 @@
+import shutil
+import psutil
+
+def chrome_processes(driver):
+    """chromedriver plus every Chrome process it spawned (empty list if unknown)."""
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return [root] + root.children(recursive=True)
+    except (psutil.Error, AttributeError):
+        return []
+
+def process_tree_rss_mb(driver):
+    total = 0
+    for p in chrome_processes(driver):
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            continue
+    return round(total / 2**20, 1)
+
+def remove_profile(driver):
+    """Delete the temp --user-data-dir make_driver created for this driver."""
+    path = getattr(driver, "profile_dir", None)
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+
+def quit_driver(driver):
+    """quit() and clean up the profile directory, whatever state the browser is in."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    remove_profile(driver)
@@ -0,0 +1,120 @@
+import json
+import pandas as pd
+
+
+def safe_sheet_name(name: str, suffix: str, tag: str = "") -> str:
+    """Excel sheet name limit is 31 chars and cannot contain: : \\ / ? * [ ]"""
+    bad = {":", "\\", "/", "?", "*", "[", "]"}
+    base = "".join(ch for ch in name if ch not in bad).strip() or "Sheet"
+    max_base_len = 31 - (len(suffix) + 1 + len(tag))
+    base = base[:max_base_len] if max_base_len > 0 else base[:25]
+    return f"{base}{tag}_{suffix}"
+
+
+def to_df_info(info: dict) -> pd.DataFrame:
+    return pd.DataFrame([info]) if info else pd.DataFrame()
+
+
+def to_df_perf(perf) -> pd.DataFrame:
+    """Flatten list[dict] or dict to table."""
+    if not perf:
+        return pd.DataFrame()
+    if isinstance(perf, list):
+        df = pd.DataFrame(perf)
+    elif isinstance(perf, dict):
+        df = pd.DataFrame([perf])
+    else:
+        return pd.DataFrame()
+
+    order = ["category", "score", "industry_percentile", "industry_rank"]
+    cols = [c for c in order if c in df.columns] + [c for c in df.columns if c not in order]
+    return df[cols]
+
+
+def to_df_salaries(salaries) -> pd.DataFrame:
+    """Handle list[list] or list[dict]."""
+    if not salaries:
+        return pd.DataFrame()
+    if isinstance(salaries[0], dict):
+        df = pd.DataFrame(salaries)
+        # nested role details don't fit in a cell; keep them as JSON text
+        if "detail" in df.columns:
+            df["detail"] = df["detail"].map(lambda d: json.dumps(d, ensure_ascii=False) if d is not None else None)
+        return df
+    return pd.DataFrame(salaries)
+
+
+def summary_row(res: dict) -> dict:
+    """One Summary-sheet row for a scrape_company() result."""
+    return {
+        "company": res["company"],
+        "status": res["status"],
+        "url": res.get("url"),
+        "info_keys": len(res.get("info") or {}),
+        "perf_rows": len(res.get("perf") or []),
+        "salary_rows": len(res.get("salaries") or []) or (res.get("streamed") or {}).get("salaries", 0),
+        "review_rows": len(res.get("reviews") or []) or (res.get("streamed") or {}).get("reviews", 0),
+        "seconds": res.get("seconds"),
+        "wait_seconds": res.get("wait_seconds"),
+        "worker": res.get("worker"),
+        "fast_path": ",".join(res["fast"]) if res.get("fast") is not None else None,
+        "error": res.get("error"),
+        "changed": ",".join(res["changed"]) if res.get("changed") is not None else None,
+        "chrome_rss_mb": res.get("chrome_rss_mb"),
+        "chrome_peak_rss_mb": res.get("chrome_peak_rss_mb"),
+        "chrome_peak_cpu_pct": res.get("chrome_peak_cpu_pct"),
+        "chrome_processes": res.get("chrome_processes"),
+        "requests": sum(w["requests"] for w in (res.get("page_weight") or {}).values()) or None,
+        "bytes": sum(w["bytes"] for w in (res.get("page_weight") or {}).values()) or None,
+        "blocked_requests": sum(w["blocked_requests"] for w in (res.get("page_weight") or {}).values()) or None,
+    }
+
+
+def write_workbook(results, output_file: str) -> None:
+    """Info/Perf/Salaries sheets per company plus a Summary sheet, in `results` order."""
+    with pd.ExcelWriter(output_file, engine="openpyxl", mode="w") as writer:
+        wrote_any_sheet = False
+        summary_rows = []
+        used = set()
+
+        def unique_sheet(company, suffix):
+            # names that only differ past the 31-char cut (or by case) get a ~2, ~3... tag
+            name, n = safe_sheet_name(company, suffix), 1
+            while name.lower() in used:
+                n += 1
+                name = safe_sheet_name(company, suffix, f"~{n}")
+            used.add(name.lower())
+            return name
+
+        for res in results:
+            company = res["company"]
+            df_info = to_df_info(res.get("info"))
+            df_perf = to_df_perf(res.get("perf"))
+            df_salaries = to_df_salaries(res.get("salaries"))
+            df_reviews = pd.DataFrame(res.get("reviews") or [])
+
+            # Write to Excel sheets
+            if not df_info.empty:
+                df_info.to_excel(writer, sheet_name=unique_sheet(company, "Info"), index=False)
+                wrote_any_sheet = True
+            if not df_perf.empty:
+                df_perf.to_excel(writer, sheet_name=unique_sheet(company, "Perf"), index=False)
+                wrote_any_sheet = True
+            if not df_salaries.empty:
+                df_salaries.to_excel(writer, sheet_name=unique_sheet(company, "Salaries"), index=False)
+                wrote_any_sheet = True
+            if not df_reviews.empty:
+                df_reviews.to_excel(writer, sheet_name=unique_sheet(company, "Reviews"), index=False)
+                wrote_any_sheet = True
+
+            summary_rows.append(res.get("summary") or summary_row(res))
+
+        # Fallback if nothing written
+        if not wrote_any_sheet:
+            pd.DataFrame({"Status": ["No valid data scraped"]}).to_excel(
+                writer, sheet_name="Empty", index=False
+            )
+
+        # Add summary sheet
+        if summary_rows:
+            pd.DataFrame(summary_rows).to_excel(writer, sheet_name="Summary", index=False)
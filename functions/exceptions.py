@@ -1,2 +1,6 @@
 class CompanyNotFound(Exception):
     pass
+
+
+class NoWorkerStarted(RuntimeError):
+    """No worker of a pool could start (e.g. every login failed)."""
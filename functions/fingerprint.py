@@ -0,0 +1,130 @@
+import atexit, hashlib, json, os, sqlite3, threading, time
+
+def fingerprint(obj):
+    """Stable content hash of extracted data (dict/list of plain values)."""
+    raw = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+class FingerprintStore:
+    """
+    Content fingerprints per company and page, kept between runs:
+    {"<slug>": {"pages": {"summary": h, "info": h, "perf": h, "salaries": h},
+                "checked_at": epoch, "changed_at": epoch, "full_at": epoch}}
+    "summary" is the cheap check (general_info only); the rest are set after a full pass.
+    A slug whose last full pass is older than `max_age` is never reported unchanged.
+    Writes are batched (at most every `save_every` seconds, plus flush() / exit).
+    """
+
+    def __init__(self, path, max_age=7 * 86400, save_every=10.0):
+        self.path = path
+        self.max_age = max_age
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.time()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+        atexit.register(self.flush)
+
+    def _save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._dirty, self._saved_at = False, time.time()
+
+    def _touch(self):
+        """Mark dirty; save if the last write is older than save_every (call with the lock held)."""
+        self._dirty = True
+        if time.time() - self._saved_at >= self.save_every:
+            self._save()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def unchanged(self, slug, page, value):
+        """True if `value` hashes the same as last time, and a full pass has been stored for the slug."""
+        with self._lock:
+            entry = self._data.get(slug)
+            same = _unchanged(entry, page, value, self.max_age)
+            if same:
+                self._touch()
+            return same
+
+    def update(self, slug, **pages):
+        """Store fingerprints for a complete full pass; returns the names of pages that changed."""
+        with self._lock:
+            changed = _update(self._data.setdefault(slug, {"pages": {}}), pages)
+            self._touch()
+            return changed
+
+
+class SqliteFingerprintStore:
+    """
+    FingerprintStore kept in a SQLite table (one JSON entry per slug), for processes
+    that share one database, e.g. queue workers on the sink's repvue.db. Every call
+    reads and writes its own row, so concurrent writers never overwrite each other's
+    slugs the way whole-file saves would.
+    """
+
+    def __init__(self, path, max_age=7 * 86400, **_):
+        self.path = path
+        self.max_age = max_age
+        self._local = threading.local()
+        self._db().execute("CREATE TABLE IF NOT EXISTS fingerprints (slug TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def _change(self, slug, fn, always_save=True):
+        """fn(entry) on the slug's entry in one write transaction; the entry is saved if always_save or fn returned True."""
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT entry FROM fingerprints WHERE slug = ?", (slug,)).fetchone()
+            entry = json.loads(row[0]) if row else {"pages": {}}
+            out = fn(entry)
+            if out or always_save:
+                db.execute("INSERT INTO fingerprints (slug, entry) VALUES (?, ?) "
+                           "ON CONFLICT (slug) DO UPDATE SET entry=excluded.entry", (slug, json.dumps(entry)))
+        return out
+
+    def unchanged(self, slug, page, value):
+        return self._change(slug, lambda entry: _unchanged(entry, page, value, self.max_age), always_save=False)
+
+    def update(self, slug, **pages):
+        return self._change(slug, lambda entry: _update(entry, pages))
+
+    def flush(self):
+        pass
+
+
+def _unchanged(entry, page, value, max_age):
+    """Compare against a stored entry; bumps its checked_at when unchanged."""
+    if not entry or "perf" not in entry["pages"]:
+        return False
+    if time.time() - entry.get("full_at", 0) > max_age:
+        return False
+    same = entry["pages"].get(page) == fingerprint(value)
+    if same:
+        entry["checked_at"] = time.time()
+    return same
+
+def _update(entry, pages):
+    new = {k: fingerprint(v) for k, v in pages.items()}
+    changed = [k for k, h in new.items() if entry["pages"].get(k) != h]
+    entry["pages"].update(new)
+    entry["checked_at"] = entry["full_at"] = time.time()
+    if changed:
+        entry["changed_at"] = entry["checked_at"]
+    return changed
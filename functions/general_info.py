@@ -1,8 +1,10 @@
-import re, math
+import re, math, time
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, JavascriptException
+from functions.instrumentation import record_event
+from functions.locator_registry import shared_locator_registry
 
 def _text_of(driver, el):
     # headless-safe text
@@ -13,14 +15,25 @@ def _text_of(driver, el):
         ) or "").strip()
     return txt
 
-def _first_present(driver, wait, locators, timeout_each=4):
-    """Try locators in order; return first present element or None."""
+def _first_present(driver, wait, locators, timeout_each=4, field=None):
+    """
+    Try locators; return first present element or None. With `field`, the order is
+    learned per field (see LocatorRegistry), otherwise it is the given order.
+    """
+    if field:
+        _, el = shared_locator_registry().first(
+            field, locators,
+            lambda how, sel: WebDriverWait(driver, timeout_each).until(EC.presence_of_element_located((how, sel))))
+        return el
     for how, sel in locators:
+        start = time.perf_counter()
         try:
             return WebDriverWait(driver, timeout_each).until(
                 EC.presence_of_element_located((how, sel))
             )
         except TimeoutException:
+            record_event("wait_timeout", where="_first_present", locator=sel,
+                         seconds=round(time.perf_counter() - start, 3))
             continue
     return None
 
@@ -62,7 +75,106 @@ def scrape_employee_ratings(driver, wait: WebDriverWait, timeout=8):
         m = re.search(r"(\d[\d,]*)\s*Employee Ratings", body_txt, re.I)
         return int(m.group(1).replace(",", "")) if m else None
 
-def scrape_general_info(driver, wait):
+GENERAL_INFO_JS = r"""
+const norm = s => (s||"").replace(/\s+/g," ").trim();
+const txt  = el => el ? norm(el.innerText || el.textContent) : "";
+const num  = (s, re) => { const m = (s||"").match(re); return m ? m : null; };
+
+// 1) RepVue Score: first h1/h2/div after the "RepVue Score" label (prefer h5/h4 labels)
+let score = null;
+let label = [...document.querySelectorAll("h5,h4")].find(h => /RepVue Score/.test(h.textContent));
+if (!label) {
+  label = [...document.querySelectorAll("body *")].find(el =>
+    /RepVue Score/.test(el.textContent) &&
+    ![...el.children].some(c => /RepVue Score/.test(c.textContent)));
+}
+if (label) {
+  const next = [...document.querySelectorAll("h1,h2,div")].find(el =>
+    (label.compareDocumentPosition(el) & Node.DOCUMENT_POSITION_FOLLOWING) && !label.contains(el));
+  const m = num(txt(next), /\d+(?:[.,]\d+)?/);
+  if (m) score = parseFloat(m[0].replace(",", "."));
+}
+
+// 2) Star rating: the __rating sibling of the __stars container (not the "Employee Ratings" count)
+let star = null;
+const stars = document.querySelector("div[class*='__stars']");
+if (stars) {
+  let r = stars.nextElementSibling;
+  while (r && !(r.tagName === "DIV" && /__rating/.test(r.className))) r = r.nextElementSibling;
+  if (!r && stars.parentElement) r = stars.parentElement.querySelector("div[class*='__rating']");
+  for (const s of (txt(r).match(/\d+(?:[.,]\d+)?/g) || [])) {
+    const v = parseFloat(s.replace(",", "."));
+    if (v > 0 && v <= 5) { star = v; break; }
+  }
+}
+
+// 3) Employee ratings (N)
+let ratings = null;
+const re = document.querySelector("div[class*='_ratings_employees']");
+let m = re ? num(txt(re), /\d[\d,]*/) : null;
+if (m) ratings = parseInt(m[0].replace(/,/g, ""));
+else {
+  m = num(document.body ? document.body.textContent : "", /(\d[\d,]*)\s*Employee Ratings/i);
+  if (m) ratings = parseInt(m[1].replace(/,/g, ""));
+}
+
+// 4) Company size + trend
+let size = null, trend = null;
+const sizeTxt = txt(document.querySelector("div[class*='_currentCount']")).replace(/[^\d]/g, "");
+if (sizeTxt) size = parseInt(sizeTxt);
+m = num(txt(document.querySelector("div[class*='_trend']")), /([+\-\u2212]?\d+(?:\.\d+)?)\s*%/);
+if (m) trend = parseFloat(m[1].replace("\u2212", "-"));
+
+return {
+  "RepVue score": score,
+  "star_rating": star,
+  "Employee ratings (N)": ratings,
+  "current_size": size,
+  "trend_pct": trend,
+};
+"""
+
+# Filled on every company page once it has rendered (trend_pct is often absent)
+REQUIRED_FIELDS = ("RepVue score", "star_rating", "Employee ratings (N)", "current_size")
+
+def scrape_general_info(driver, wait, timeout=8, poll=0.2, grace=3.0):
+    """
+    Scrape the company overview in one JS shot per poll, returning the same keys as
+    scrape_general_info_dom. Polls until two consecutive reads agree and every
+    REQUIRED_FIELDS value is filled; fields that never render are given up on
+    `grace` seconds after the first one appeared (or at `timeout`).
+    Falls back to the per-element Selenium path if the script itself fails; a page
+    that never loads raises the wait's TimeoutException instead.
+    """
+    wait.until(EC.any_of(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "h1")),
+        EC.url_contains("/comp")
+    ))
+    try:
+        last, first_at = None, None
+        deadline = time.monotonic() + timeout
+        while True:
+            cur = driver.execute_script(GENERAL_INFO_JS)
+            now = time.monotonic()
+            if first_at is None and any(v is not None for v in cur.values()):
+                first_at = now
+            if cur == last and all(cur.get(k) is not None for k in REQUIRED_FIELDS):
+                return cur
+            if cur == last and first_at is not None and now - first_at >= grace:
+                record_event("partial", where="scrape_general_info",
+                             missing=",".join(k for k in REQUIRED_FIELDS if cur.get(k) is None))
+                return cur
+            if now >= deadline:
+                record_event("wait_timeout", where="scrape_general_info", seconds=timeout)
+                return cur
+            last = cur
+            time.sleep(poll)
+    except JavascriptException as e:
+        record_event("fallback", where="scrape_general_info", to="dom", error=type(e).__name__)
+        return scrape_general_info_dom(driver, wait)
+
+def scrape_general_info_dom(driver, wait):
+    """Original element-by-element scraper; kept as the fallback for scrape_general_info."""
     general_info = {}
 
     # 0) Make sure the company page is actually loaded (header/title present)
@@ -75,7 +187,7 @@ def scrape_general_info(driver, wait):
     score_el = _first_present(driver, wait, [
         (By.XPATH, "//*[self::h5 or self::h4][contains(.,'RepVue Score')]/following::*[self::h1 or self::h2 or self::div][1]"),
         (By.XPATH, "//*[contains(.,'RepVue Score')]/following::*[self::h1 or self::h2 or self::div][1]"),
-    ])
+    ], field="general_info.repvue_score")
     if score_el:
         raw = _text_of(driver, score_el)
         m = re.search(r"\d+(?:[.,]\d+)?", raw)
@@ -0,0 +1,67 @@
+"""
+Browserless fast path: fetch RepVue pages over a pooled keep-alive `requests`
+session that carries the logged-in browser's cookies, and parse the data blobs
+embedded in the server-rendered HTML (Next.js __NEXT_DATA__ and other JSON
+<script> tags). The blobs go through the same mappers as network-capture mode.
+"""
+import json, re
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "https://www.repvue.com"
+
+_JSON_SCRIPT = re.compile(
+    r"<script[^>]*type=[\"']application/(?:ld\+)?json[\"'][^>]*>(.*?)</script>", re.S | re.I
+)
+_NEXT_DATA = re.compile(r"<script[^>]*id=[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>", re.S | re.I)
+
+def session_from_driver(driver, pool_size=10, retries=2):
+    """requests.Session seeded with the driver's cookies and user agent."""
+    s = requests.Session()
+    s.headers.update({
+        "User-Agent": driver.execute_script("return navigator.userAgent;"),
+        "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    for c in driver.get_cookies():
+        s.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size,
+        # the last 503 comes back as a response (not RetryError) so fetch_payloads can report it
+        max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                          raise_on_status=False),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+def embedded_payloads(html, url=None):
+    """JSON blobs embedded in a page, shaped like network_capture payloads: [{url, status, body}]."""
+    out = []
+    blobs = _NEXT_DATA.findall(html) or []
+    blobs += [b for b in _JSON_SCRIPT.findall(html) if b not in blobs]
+    for raw in blobs:
+        try:
+            out.append({"url": url, "status": 200, "body": json.loads(raw)})
+        except ValueError:
+            continue
+    return out
+
+def fetch_payloads(session, url, timeout=15):
+    """
+    GET `url` and return its embedded payloads, or None if the response can't be
+    used (error status, or bounced to /login because the session expired).
+    Raises requests.HTTPError on 429/503, so a rate limiter sees the throttling.
+    """
+    r = session.get(url, timeout=timeout)
+    if r.status_code in (429, 503):
+        r.raise_for_status()
+    if r.status_code != 200 or "/login" in r.url:
+        return None
+    if "json" in r.headers.get("Content-Type", ""):
+        try:
+            return [{"url": r.url, "status": r.status_code, "body": r.json()}]
+        except ValueError:
+            return None
+    return embedded_payloads(r.text, r.url)
@@ -0,0 +1,144 @@
+"""
+Streaming extraction for lazily loaded / paginated lists (salaries, reviews).
+
+Each round runs a one-shot extractor that returns only rows it has not returned
+before (it marks them with data-rv-seen), then clicks the list's own "Load more" /
+"Next" control (or, for infinite-scroll lists, scrolls to the bottom), and waits
+for new rows. With scroll=False a list without such a control ends after the first round. Rows are yielded as they are
+found and deduplicated by `key`, so the caller can write them out before the
+list is exhausted and memory stays flat.
+"""
+import time
+from selenium.common.exceptions import WebDriverException
+
+from functions.salaries_table import SALARIES_JS
+from functions.instrumentation import record_event
+from functions.rate_limit import throttle_signal
+
+# Review cards on /companies/<slug>/reviews; same incremental contract as SALARIES_JS.
+REVIEWS_JS = r"""
+const incremental = !!arguments[0];
+const norm = s => (s||"").replace(/\s+/g," ").trim();
+const cards = [...document.querySelectorAll(
+  "[class*='ReviewCard'], [class*='reviewCard'], [class*='review-card'], [class*='review_card'], article"
+)].filter(el => !el.parentElement || !el.parentElement.closest(
+  "[class*='ReviewCard'], [class*='reviewCard'], [class*='review-card'], [class*='review_card'], article"))
+  .filter(el => !(incremental && el.dataset.rvSeen));
+if (incremental) cards.forEach(el => { el.dataset.rvSeen = "1"; });
+
+function hash(s){ let h = 0; for (let i = 0; i < s.length; i++) h = (h * 31 + s.charCodeAt(i)) | 0; return (h >>> 0).toString(16); }
+
+return cards.map(el => {
+  const text = norm(el.innerText || el.textContent);
+  const title = el.querySelector("h2,h3,h4");
+  const a = el.querySelector("a[href*='/reviews/']");
+  const t = el.querySelector("time");
+  const m = text.match(/(\d(?:\.\d)?)\s*(?:\/\s*5|out of 5|stars?)/i);
+  const dm = text.match(/\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}\b/);
+  return {
+    link: a ? a.href : location.href.split("#")[0] + "#review-" + hash(text),
+    title: title ? norm(title.textContent) : null,
+    rating: m ? parseFloat(m[1]) : null,
+    date: t ? (t.getAttribute("datetime") || norm(t.textContent)) : (dm ? dm[0] : null),
+    text: text,
+  };
+});
+"""
+
+# Click the "load more"-style button or next-page link of the list being read.
+# The control must come after the last row read (data-rv-seen) and sit inside the
+# rows' common container or at most 3 levels above it, so unrelated widgets on the
+# page are never clicked. arguments[0] = scroll to the bottom when there is none.
+# Returns what it did, so the caller knows whether anything can still come.
+ADVANCE_JS = r"""
+const scroll = !!arguments[0];
+const rows = [...document.querySelectorAll("[data-rv-seen]")];
+if (!rows.length) return "end";
+const last = rows[rows.length - 1];
+let box = rows[0].parentElement;
+while (box && !rows.every(r => box.contains(r))) box = box.parentElement;
+
+const re = /^(load|show|view|see) more|^more (reviews|roles|salaries|companies)|^next( page)?$/i;
+const isControl = b => (re.test((b.innerText || b.textContent || "").trim()) || /next/i.test(b.getAttribute("aria-label") || "") || b.rel === "next")
+  && !b.disabled && b.getAttribute("aria-disabled") !== "true" && b.offsetParent !== null
+  && !b.closest("[data-rv-seen]") && (last.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING);
+let btn = null;
+for (let i = 0; box && box !== document.body && !btn && i < 4; i++, box = box.parentElement)
+  btn = [...box.querySelectorAll("button, a[role='button'], a[rel='next'], [aria-label='Next'], [aria-label='Next page']")].find(isControl);
+if (btn) { btn.scrollIntoView({block: "center"}); btn.click(); return "click"; }
+if (!scroll) return "end";
+const before = window.scrollY;
+window.scrollTo(0, document.body.scrollHeight);
+return window.scrollY > before ? "scroll" : "end";
+"""
+
+def iter_list_rows(driver, extract_js, key="link", settle=3.0, quiet=0.6, poll=0.2,
+                   max_rounds=500, idle_rounds=2, scroll=False, limiter=None):
+    """
+    Generator over every row of a lazily loaded list.
+
+    extract_js:  script honouring arguments[0] = incremental (see SALARIES_JS / REVIEWS_JS)
+    settle:      max seconds to wait for new rows after each click/scroll
+    quiet:       ...but give up sooner if the page started no network request for this long
+    idle_rounds: stop after this many advances in a row that produced nothing new
+    scroll:      scroll to the bottom when the list has no load-more/next control
+                 (infinite-scroll lists); otherwise such a list ends after one round
+    limiter:     optional RateLimiter; each click/scroll takes a token, and the page
+                 it produced is checked for throttling signals
+    """
+    seen = set()
+    idle = 0
+    advanced_at, resources = None, None
+    for _ in range(max_rounds):
+        fresh = []
+        while True:
+            try:
+                batch = driver.execute_script(extract_js, True) or []
+            except WebDriverException:
+                batch = []   # mid-navigation after a "next page" click
+            fresh = [r for r in batch if r.get(key) and r[key] not in seen]
+            if fresh or advanced_at is None:
+                break
+            waited = time.monotonic() - advanced_at
+            if waited >= settle:
+                break
+            if waited >= quiet and _resource_count(driver) == resources:
+                break        # nothing was even requested: the list is not growing
+            time.sleep(poll)
+        if limiter is not None and advanced_at is not None:
+            limiter.report(throttle_signal(driver), "pagination")
+
+        for r in fresh:
+            seen.add(r[key])
+            yield r
+
+        idle = 0 if fresh else idle + 1
+        if idle >= idle_rounds:
+            return
+        resources = _resource_count(driver)
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            action = driver.execute_script(ADVANCE_JS, scroll)
+        except WebDriverException:
+            action = "end"
+        if action == "end" and (not scroll or not fresh):
+            return
+        advanced_at = time.monotonic()
+    record_event("list_truncated", rows=len(seen), rounds=max_rounds)
+
+def _resource_count(driver):
+    try:
+        return driver.execute_script("return performance.getEntriesByType('resource').length;")
+    except WebDriverException:
+        return None
+
+def iter_salaries(driver, **kwargs):
+    """Salary rows (scrape_salaries_table schema) across "load more"/scroll, deduplicated by link."""
+    kwargs.setdefault("scroll", True)
+    return (r for r in iter_list_rows(driver, SALARIES_JS, key="link", **kwargs) if r.get("role"))
+
+def iter_reviews(driver, **kwargs):
+    """Review dicts {link, title, rating, date, text} from the reviews page (which may scroll infinitely)."""
+    kwargs.setdefault("scroll", True)
+    return iter_list_rows(driver, REVIEWS_JS, key="link", **kwargs)
@@ -0,0 +1,148 @@
+"""
+Per-stage timing for RepVueService and the scrapers.
+
+    tracer = Tracer()
+    svc = RepVueService.create(tracer=tracer)
+    ...
+    tracer.export_jsonl("trace.jsonl")        # one line per span / event
+    tracer.export_prometheus("repvue.prom")   # textfile-collector format
+
+Spans are opened by RepVueService (@traced stages) and nest per thread, so parallel
+workers can share one Tracer. Scrapers report waits and fallbacks with
+record_event(), which is a no-op when no span is active. When a driver is
+instrumented, every WebDriver command is counted, per command name and on the
+innermost open span.
+"""
+import contextvars, functools, json, os, threading, time
+from contextlib import contextmanager, nullcontext
+
+_active = contextvars.ContextVar("repvue_span", default=None)  # (tracer, span dict) of the innermost span
+
+class Tracer:
+    def __init__(self):
+        self.records = []
+        self.commands = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **attrs):
+        parent = _active.get()
+        span = {
+            "type": "span", "name": name, "attrs": attrs,
+            "parent": parent[1]["name"] if parent else None,
+            "thread": threading.current_thread().name,
+            "ts": time.time(), "commands": 0, "error": None,
+        }
+        token = _active.set((self, span))
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span["error"] = type(e).__name__
+            raise
+        finally:
+            span["seconds"] = round(time.perf_counter() - start, 4)
+            _active.reset(token)
+            with self._lock:
+                self.records.append(span)
+
+    def event(self, name, **attrs):
+        parent = _active.get()
+        with self._lock:
+            self.records.append({
+                "type": "event", "name": name, "attrs": attrs,
+                "parent": parent[1]["name"] if parent else None,
+                "thread": threading.current_thread().name, "ts": time.time(),
+            })
+
+    def instrument(self, driver):
+        """Count every WebDriver command sent through `driver` (idempotent)."""
+        if getattr(driver, "_repvue_tracer", None) is self:
+            return driver
+        original = getattr(driver, "_repvue_execute", None) or driver.execute
+
+        @functools.wraps(original)
+        def execute(driver_command, params=None):
+            with self._lock:
+                self.commands[driver_command] = self.commands.get(driver_command, 0) + 1
+            cur = _active.get()
+            if cur:
+                cur[1]["commands"] += 1
+            return original(driver_command, params)
+
+        driver._repvue_execute = original
+        driver._repvue_tracer = self
+        driver.execute = execute
+        return driver
+
+    # ---- export ----
+    def export_jsonl(self, path):
+        with self._lock:
+            records = list(self.records)
+        with open(path, "a", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r, default=str) + "\n")
+
+    def summary(self):
+        """{stage: {count, seconds, commands, errors}} and {event: count}."""
+        stages, events = {}, {}
+        with self._lock:
+            records = list(self.records)
+        for r in records:
+            if r["type"] == "span":
+                s = stages.setdefault(r["name"], {"count": 0, "seconds": 0.0, "commands": 0, "errors": 0})
+                s["count"] += 1
+                s["seconds"] += r["seconds"]
+                s["commands"] += r["commands"]
+                s["errors"] += r["error"] is not None
+            else:
+                events[r["name"]] = events.get(r["name"], 0) + 1
+        return stages, events
+
+    def export_prometheus(self, path):
+        stages, events = self.summary()
+        lines = [
+            "# HELP repvue_stage_seconds_total Time spent per scrape stage.",
+            "# TYPE repvue_stage_seconds_total counter",
+            *(f'repvue_stage_seconds_total{{stage="{k}"}} {v["seconds"]:.4f}' for k, v in stages.items()),
+            "# HELP repvue_stage_calls_total Calls per scrape stage.",
+            "# TYPE repvue_stage_calls_total counter",
+            *(f'repvue_stage_calls_total{{stage="{k}"}} {v["count"]}' for k, v in stages.items()),
+            "# HELP repvue_stage_errors_total Failed calls per scrape stage.",
+            "# TYPE repvue_stage_errors_total counter",
+            *(f'repvue_stage_errors_total{{stage="{k}"}} {v["errors"]}' for k, v in stages.items()),
+            "# HELP repvue_stage_webdriver_commands_total WebDriver commands issued inside each stage.",
+            "# TYPE repvue_stage_webdriver_commands_total counter",
+            *(f'repvue_stage_webdriver_commands_total{{stage="{k}"}} {v["commands"]}' for k, v in stages.items()),
+            "# HELP repvue_webdriver_commands_total WebDriver commands by command name.",
+            "# TYPE repvue_webdriver_commands_total counter",
+            *(f'repvue_webdriver_commands_total{{command="{k}"}} {v}' for k, v in sorted(self.commands.items())),
+            "# HELP repvue_events_total Waits timed out / fallbacks taken.",
+            "# TYPE repvue_events_total counter",
+            *(f'repvue_events_total{{event="{k}"}} {v}' for k, v in sorted(events.items())),
+        ]
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+
+def record_event(name, **attrs):
+    """Report a wait/fallback from scraper code; no-op outside a traced stage."""
+    cur = _active.get()
+    if cur:
+        cur[0].event(name, **attrs)
+
+def span(tracer, name, **attrs):
+    """tracer.span(...) or a no-op context when tracer is None."""
+    return tracer.span(name, **attrs) if tracer is not None else nullcontext()
+
+def traced(stage):
+    """Method decorator: run inside a `stage` span of self.tracer (if any)."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            with span(getattr(self, "tracer", None), stage):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return deco
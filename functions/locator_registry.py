@@ -0,0 +1,114 @@
+import atexit, json, os, threading, time
+from selenium.common.exceptions import TimeoutException
+
+from functions.instrumentation import record_event
+
+DEFAULT_LOCATOR_FILE = os.getenv("REPVUE_LOCATOR_STATS", ".repvue_locators.json")
+
+class LocatorRegistry:
+    """
+    Remembers which locator found each field and tries that one first next time.
+
+    Fallback locators used to be tried in a fixed order with a timeout each, so a
+    stale first choice cost its full timeout on every page. Each locator now has a
+    recency-weighted hit rate (EWMA, `alpha` per attempt, 0.5 for unseen ones):
+    after a layout change the new winner outranks the old one after a single
+    miss, so the slow path is paid once per change. Stats persist across runs:
+    {"<field>": {"<how>=<selector>": {"rate", "hits", "misses", "waste_seconds", "last_hit"}}}
+    """
+
+    def __init__(self, path=DEFAULT_LOCATOR_FILE, alpha=0.5, save_every=30.0):
+        self.path = path
+        self.alpha = alpha
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.time()
+        self._data = self._load()
+        atexit.register(self.save)
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self._dirty, self._saved_at = False, time.time()
+
+    @staticmethod
+    def _key(locator):
+        how, sel = locator
+        return f"{how}={sel}"
+
+    def order(self, field, locators):
+        """`locators` sorted by learned hit rate (declared order breaks ties)."""
+        with self._lock:
+            stats = self._data.get(field, {})
+            rate = [stats.get(self._key(l), {}).get("rate", 0.5) for l in locators]
+        return [l for _, _, l in sorted(zip((-r for r in rate), range(len(locators)), locators))]
+
+    def record(self, field, locator, hit, seconds):
+        with self._lock:
+            s = self._data.setdefault(field, {}).setdefault(
+                self._key(locator), {"rate": 0.5, "hits": 0, "misses": 0, "waste_seconds": 0.0})
+            s["rate"] = round(s["rate"] * (1 - self.alpha) + self.alpha * hit, 4)
+            if hit:
+                s["hits"] += 1
+                s["last_hit"] = time.time()
+            else:
+                s["misses"] += 1
+                s["waste_seconds"] = round(s["waste_seconds"] + seconds, 3)
+            self._dirty = True
+            due = time.time() - self._saved_at > self.save_every
+        if due:
+            self.save()
+
+    def first(self, field, locators, attempt):
+        """
+        Call attempt(how, sel) for each locator in learned order until one returns
+        without TimeoutException; returns (locator, value) or (None, None).
+        """
+        for loc in self.order(field, locators):
+            start = time.perf_counter()
+            try:
+                value = attempt(*loc)
+            except TimeoutException:
+                seconds = time.perf_counter() - start
+                self.record(field, loc, False, seconds)
+                record_event("wait_timeout", where=field, locator=loc[1], seconds=round(seconds, 3))
+                continue
+            self.record(field, loc, True, time.perf_counter() - start)
+            return loc, value
+        return None, None
+
+    def waste_report(self):
+        """Per field: seconds lost to locators that missed, worst first."""
+        with self._lock:
+            rows = [{"field": f, "locator": k, **{c: s.get(c) for c in ("rate", "hits", "misses", "waste_seconds")}}
+                    for f, locs in self._data.items() for k, s in locs.items()]
+        by_field = {}
+        for r in rows:
+            by_field[r["field"]] = by_field.get(r["field"], 0) + r["waste_seconds"]
+        return sorted(rows, key=lambda r: (-by_field[r["field"]], r["field"], -r["waste_seconds"]))
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+def shared_locator_registry(path=DEFAULT_LOCATOR_FILE):
+    """One LocatorRegistry per file per process, shared by all workers."""
+    with _shared_lock:
+        if path not in _shared:
+            _shared[path] = LocatorRegistry(path)
+        return _shared[path]
@@ -3,6 +3,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
+from functions.instrumentation import record_event
 
 def _safe_click(driver, el):
     try:
@@ -31,6 +32,7 @@ def login_repVue(driver, email, password, timeout=15):
         )
         _safe_click(driver, btn)
     except TimeoutException:
+        record_event("wait_timeout", where="login_cookie_banner", seconds=3)
         pass  # no banner
 
     # 2. Wait for form fields
@@ -47,6 +49,7 @@ def login_repVue(driver, email, password, timeout=15):
     try:
         submit = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
     except Exception:
+        record_event("fallback", where="login_submit", to="xpath")
         submit = driver.find_element(By.XPATH, "//button[normalize-space()='Sign In' or normalize-space()='Log In']")
 
     _safe_click(driver, submit)
@@ -2,8 +2,14 @@
 import os, shutil, tempfile
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from functions.request_blocking import apply_blocking
 
-def make_driver(headless=True):
+def make_driver(headless=True, block_profile=None, record_network=False):
+    """
+    block_profile:  optional request_blocking.BlockProfile (skip images/fonts/media/trackers)
+    record_network: keep Chrome performance logs (request_blocking.page_weight()); implied
+                    by a block profile with record=True
+    """
     opts = Options()
 
     # Headless is usually faster/stabler in WSL
@@ -23,14 +29,21 @@ def make_driver(headless=True):
     opts.add_argument("--disable-blink-features=AutomationControlled")
 
     # Kill password/autofill UI
-    opts.add_experimental_option("prefs", {
+    prefs = {
         "credentials_enable_service": False,
         "profile.password_manager_enabled": False,
         "autofill.profile_enabled": False,
         "autofill.credit_card_enabled": False,
         "profile.default_content_setting_values.notifications": 2,
         "profile.default_content_setting_values.cookies": 1,
-    })
+    }
+    if block_profile:
+        prefs.update(block_profile.prefs())
+    opts.add_experimental_option("prefs", prefs)
+
+    # Network events for page-weight reporting
+    if record_network or (block_profile and block_profile.record):
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     opts.add_argument("--disable-features=AutofillServerCommunication,PasswordManagerOnboarding")
 
     # Fresh ephemeral profile
@@ -46,7 +59,11 @@ def make_driver(headless=True):
         opts.binary_location = chrome_bin
 
     driver = webdriver.Chrome(options=opts)
+    driver.profile_dir = tmp_profile    # removed by driver_lifecycle.quit_driver()
     driver.set_page_load_timeout(120)   # give navigation breathing room
     driver.set_script_timeout(30)
     driver.implicitly_wait(0)
+
+    if block_profile:
+        apply_blocking(driver, block_profile)
     return driver
\ No newline at end of file
@@ -1,17 +1,36 @@
+import time
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from functions.instrumentation import record_event
+from functions.locator_registry import shared_locator_registry
 
-def navigation(driver, wait, company, page):
-    try:
-        # FIXED selector (closed quote)
-        link = wait.until(EC.element_to_be_clickable((
-            By.CSS_SELECTOR, f"a[href$='/companies/{company}/{page}']"
-        )))
+# The page's own link, else a direct load (SPA-safe). Learned per page by the
+# LocatorRegistry, so a link that keeps missing stops costing its wait on every company.
+NAV_LOCATORS = [
+    (By.CSS_SELECTOR, "a[href$='/companies/{company}/{page}']"),
+    ("url", "https://www.repvue.com/companies/{company}/{page}"),
+]
+
+def navigation(driver, wait, company, page, load=None):
+    """Open /companies/<company>/<page>; `load` (a RateLimiter.limit() dict) gets the load time without the link wait."""
+    def attempt(how, sel):
+        target = sel.format(company=company, page=page)
+        if how == "url":
+            record_event("fallback", where="navigation", to="driver.get", page=page)
+            start = time.monotonic()
+            driver.get(target)
+            return start
+        link = wait.until(EC.element_to_be_clickable((how, target)))
+        start = time.monotonic()
         driver.execute_script("arguments[0].click();", link)
-    except TimeoutException:
-        # Fallback: navigate directly (SPA-safe)
-        driver.get(f"https://www.repvue.com/companies/{company}/{page}")
+        return start
+
+    loc, start = shared_locator_registry().first(f"navigation.{page}", NAV_LOCATORS, attempt)
+    if loc is None:
+        raise TimeoutException(f"Could not open the {page} page of {company}")
 
     # Robust URL wait (allows trailing slash or extras)
     wait.until(EC.url_matches(rf"/companies/[^/]+/{page}(?:/|$)"))
+    if load is not None:
+        load["seconds"] = time.monotonic() - start
@@ -0,0 +1,199 @@
+"""
+Network-capture mode: read the JSON responses the RepVue SPA fetches (via Chrome's
+performance log + CDP Network.getResponseBody) and map them straight into the
+dicts the DOM scrapers return. Each map_* function returns None when it can't find
+its data.
+
+The API shape isn't documented, so the mappers look for the fields by a list of
+plausible key names, and only inside objects that belong to the company's slug
+(the object's own "slug", the nearest enclosing object's, or the payload URL).
+Because the key lists have not been checked against a recorded payload, the
+browser scrapers only use mapped values to fill what the DOM left empty. Set
+`dump_dir` on capture_json() to save raw payloads when a mapping needs updating.
+"""
+import json, os, re, time
+from selenium.common.exceptions import WebDriverException
+
+def read_performance_log(driver):
+    """Drain Chrome's performance log -> list of CDP messages ({method, params})."""
+    return [json.loads(e["message"])["message"] for e in driver.get_log("performance")]
+
+def capture_json(driver, messages, url_filter=r"repvue\.com", dump_dir=None):
+    """
+    JSON bodies of the responses in `messages` (from read_performance_log) whose URL matches `url_filter`.
+    Returns [{url, status, body}] in arrival order.
+    """
+    out = []
+    for m in messages:
+        if m.get("method") != "Network.responseReceived":
+            continue
+        p = m["params"]
+        resp = p.get("response", {})
+        if "json" not in (resp.get("mimeType") or "") or not re.search(url_filter, resp.get("url", "")):
+            continue
+        try:
+            raw = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": p["requestId"]})
+            body = json.loads(raw.get("body") or "null")
+        except (WebDriverException, ValueError):
+            continue  # evicted from the buffer, still in flight, or not really JSON
+        out.append({"url": resp["url"], "status": resp.get("status"), "body": body})
+
+    if dump_dir and out:
+        os.makedirs(dump_dir, exist_ok=True)
+        with open(os.path.join(dump_dir, f"capture-{int(time.time() * 1000)}.json"), "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=1)
+    return out
+
+# ---------- helpers ----------
+
+def _walk(node):
+    """Yield every dict and list in a JSON tree."""
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, dict):
+            yield n
+            stack.extend(n.values())
+        elif isinstance(n, list):
+            yield n
+            stack.extend(n)
+
+def _walk_scoped(node, owner=None):
+    """Like _walk, but yields (node, owner) with owner = "slug" of the nearest enclosing dict that has one."""
+    stack = [(node, owner)]
+    while stack:
+        n, owner = stack.pop()
+        if isinstance(n, dict):
+            yield n, owner
+            inner = n.get("slug") if n.get("slug") is not None else owner
+            stack.extend((v, inner) for v in n.values())
+        elif isinstance(n, list):
+            yield n, owner
+            stack.extend((v, owner) for v in n)
+
+def _same_slug(a, b):
+    return a is not None and b is not None and str(a).lower() == str(b).lower()
+
+def _url_has_slug(url, slug):
+    return bool(url) and re.search(rf"/{re.escape(slug)}(?:[/?#.]|$)", url, re.I) is not None
+
+def _pick(d, keys):
+    for k in keys:
+        if d.get(k) is not None:
+            return d[k]
+    return None
+
+def _num(v, cast=float):
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)):
+        return cast(v)
+    m = re.search(r"[+\-]?\d+(?:\.\d+)?", str(v).replace(",", ""))
+    return cast(float(m.group())) if m else None
+
+# ---------- mappers ----------
+
+# Only specific names: generic ones (trend, score, value, name, label, count...) match too much.
+GENERAL_KEYS = {
+    "RepVue score": ("repvue_score", "repvueScore"),
+    "star_rating": ("star_rating", "starRating", "average_rating", "averageRating"),
+    "Employee ratings (N)": ("ratings_count", "ratingsCount", "employee_ratings_count"),
+    "current_size": ("current_count", "currentCount", "employee_count", "employeeCount", "headcount"),
+    "trend_pct": ("headcount_trend", "headcountTrend", "growth_pct", "growthPercent"),
+}
+
+def map_general_info(payloads, slug):
+    """The company object whose own "slug" is `slug` -> scrape_general_info() dict (None if not found)."""
+    if not slug:
+        return None
+    best, best_hits = None, 0
+    for p in payloads:
+        for d in _walk(p["body"]):
+            if not isinstance(d, dict) or not _same_slug(d.get("slug"), slug):
+                continue
+            hits = sum(_pick(d, keys) is not None for keys in GENERAL_KEYS.values())
+            if hits > best_hits:
+                best, best_hits = d, hits
+    # the score is RepVue-specific; without it this is some other object carrying the slug
+    if best is None or best_hits < 2 or _pick(best, GENERAL_KEYS["RepVue score"]) is None:
+        return None
+    return {
+        "RepVue score": _num(_pick(best, GENERAL_KEYS["RepVue score"])),
+        "star_rating": _num(_pick(best, GENERAL_KEYS["star_rating"])),
+        "Employee ratings (N)": _num(_pick(best, GENERAL_KEYS["Employee ratings (N)"]), int),
+        "current_size": _num(_pick(best, GENERAL_KEYS["current_size"]), int),
+        "trend_pct": _num(_pick(best, GENERAL_KEYS["trend_pct"])),
+    }
+
+def _rows_with(payloads, required, slug):
+    """
+    Longest list of dicts that have one key from each group in `required`, inside
+    an object with this `slug` (or, if no enclosing object has a slug, in a payload
+    whose URL names it).
+    """
+    best = []
+    if not slug:
+        return best
+    for p in payloads:
+        for lst, owner in _walk_scoped(p["body"]):
+            if not isinstance(lst, list) or not lst or not all(isinstance(x, dict) for x in lst):
+                continue
+            if not (_same_slug(owner, slug) or (owner is None and _url_has_slug(p.get("url"), slug))):
+                continue
+            if all(any(_pick(x, keys) is not None for x in lst) for keys in required) and len(lst) > len(best):
+                best = lst
+    return best
+
+PERF_KEYS = {
+    "category": ("category", "category_name", "categoryName"),
+    "score": ("category_score", "categoryScore", "score"),
+    "industry_percentile": ("industry_percentile", "industryPercentile", "percentile"),
+    "industry_rank": ("industry_rank", "industryRank", "rank"),
+}
+
+def map_performance(payloads, slug):
+    rows = _rows_with(payloads, (PERF_KEYS["category"], PERF_KEYS["score"], PERF_KEYS["industry_percentile"]), slug)
+    if not rows:
+        return None
+    return [{
+        "category": _pick(r, PERF_KEYS["category"]),
+        "score": _num(_pick(r, PERF_KEYS["score"])),
+        "industry_percentile": _num(_pick(r, PERF_KEYS["industry_percentile"])),
+        "industry_rank": _num(_pick(r, PERF_KEYS["industry_rank"]), int),
+    } for r in rows]
+
+SALARY_KEYS = {
+    "role": ("role", "role_name", "roleName", "job_title"),
+    "ratings_count": ("ratings_count", "ratingsCount", "num_ratings"),
+    "median_base_pay": ("median_base_pay", "medianBasePay", "median_base", "base_pay", "basePay"),
+    "median_ote": ("median_ote", "medianOte", "ote"),
+    "top_performers": ("top_performers", "topPerformers", "top_performer_ote"),
+    "quota_attainment_pct": ("quota_attainment", "quotaAttainment", "quota_attainment_pct", "percent_hitting_quota"),
+    "role_slug": ("slug", "role_slug", "roleSlug"),
+}
+
+def map_salaries(payloads, company_slug):
+    """-> scrape_salaries_table() rows. API values are single numbers, so *_is_range is False and min == max."""
+    rows = _rows_with(payloads, (SALARY_KEYS["role"], SALARY_KEYS["median_base_pay"]), company_slug)
+    if not rows:
+        return None
+    out = []
+    for r in rows:
+        row = {"role": _pick(r, SALARY_KEYS["role"]),
+               "ratings_count": _num(_pick(r, SALARY_KEYS["ratings_count"]), int)}
+        for f in ("median_base_pay", "median_ote", "top_performers"):
+            v = _num(_pick(r, SALARY_KEYS[f]), int)
+            row.update({f: v, f"{f}_is_range": False, f"{f}_min": v, f"{f}_max": v})
+        row["quota_attainment_pct"] = _num(_pick(r, SALARY_KEYS["quota_attainment_pct"]))
+        role_slug = _pick(r, SALARY_KEYS["role_slug"])
+        row["link"] = (f"https://www.repvue.com/companies/{company_slug}/salaries/{role_slug}"
+                       if role_slug else None)
+        if row["role"]:
+            out.append(row)
+    return out or None
+
+def fill_missing(scraped, mapped):
+    """scrape_general_info() dict with its None fields taken from a mapped one."""
+    if not mapped:
+        return scraped
+    return {**scraped, **{k: v for k, v in mapped.items() if scraped.get(k) is None and v is not None}}
@@ -1,6 +1,9 @@
 import re
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from functions.instrumentation import record_event
 
 def _to_float(s):
     if not s: return None
@@ -18,7 +21,66 @@ def _text_or_none(node, by, value):
     except Exception:
         return None
 
-def scrape_performance_table(driver, wait):
+# Same anchors as the DOM path below, but every cell read in one execute_script.
+# Returns null until the table exists so it can be polled; the rows are wrapped in
+# {rows: [...]} so an empty table is still a truthy (final) result for WebDriverWait.
+PERFORMANCE_JS = r"""
+const text = el => el ? (el.innerText || el.textContent || "").trim() : null;
+const table = [...document.querySelectorAll("div[class*='performance-table']")].find(t =>
+  [...t.querySelectorAll("div")].some(d => (d.textContent || "").replace(/\s+/g, " ").trim() === "Category Score"));
+if (!table) return null;
+
+// first descendant (document order) whose text contains `needle`, like XPath //*[contains(.,needle)][1]
+const firstContaining = (root, needle) =>
+  root ? [...root.querySelectorAll("*")].find(el => (el.textContent || "").includes(needle)) : null;
+
+return {rows: [...table.querySelectorAll("div[class*='performance-table__cell']")]
+  .filter(cell => cell.querySelector("div[class*='category-data__name']"))
+  .map(cell => ({
+    name:  text(cell.querySelector("div[class*='category-data__name']")),
+    score: text(cell.querySelector("div[class*='category-data__value']")),
+    pct:   text(firstContaining(cell.querySelector("div[class*='industry-percentile']"), "%")),
+    rank:  text(firstContaining(cell.querySelector("div[class*='industry-data']"), "#")),
+  }))};
+"""
+
+def scrape_performance_table(driver, wait, batched=True, timeout=20):
+    """
+    Returns [{category, score, industry_percentile, industry_rank}, ...].
+    batched=True reads the whole table in one in-page script; batched=False uses the
+    original per-cell XPath lookups (4 round trips per category) for comparison.
+    """
+    if not batched:
+        return scrape_performance_table_dom(driver, wait)
+
+    try:
+        rows = WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script(PERFORMANCE_JS)
+        )["rows"]
+    except TimeoutException:
+        record_event("wait_timeout", where="scrape_performance_table", seconds=timeout)
+        raise TimeoutException("Performance table not found")
+
+    return [{
+        "category": r.get("name"),
+        "score": _to_float(r.get("score")),
+        "industry_percentile": _to_float(r.get("pct")),
+        "industry_rank": _to_int(r.get("rank") or ""),
+    } for r in rows]
+
+def compare_performance_modes(driver, wait):
+    """Run both implementations on the current page; returns a list of differing rows (empty = identical)."""
+    batched = scrape_performance_table(driver, wait, batched=True)
+    dom = scrape_performance_table_dom(driver, wait)
+    diffs = []
+    for i in range(max(len(batched), len(dom))):
+        a = batched[i] if i < len(batched) else None
+        b = dom[i] if i < len(dom) else None
+        if a != b:
+            diffs.append({"index": i, "batched": a, "dom": b})
+    return diffs
+
+def scrape_performance_table_dom(driver, wait):
     # Anchor on the table container (don’t rely on the exact hash)
     table = wait.until(EC.presence_of_element_located((
         By.XPATH,
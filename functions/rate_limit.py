@@ -0,0 +1,219 @@
+"""
+Shared token-bucket limiter for page loads, with adaptive (AIMD) backoff.
+
+    limiter = RateLimiter(rate=1.0)                       # one per process, shared by all workers
+    limiter = RateLimiter(rate=1.0, state_file="/tmp/repvue.rate")   # ... or across processes
+    svc = RepVueService.create(rate_limiter=limiter)
+
+Every navigation/search/page load, role-detail tab, list "load more" click and
+fast-path HTTP request takes a token first. Afterwards the outcome is reported:
+a throttling signal (a page that never finished loading, slow response, error
+page, bounce to /login, HTTP 429/503) halves the rate and pauses everyone for a cooldown that
+grows with consecutive hits; every `recover_after` clean loads add `step` back,
+up to `max_rate`. Further throttled reports during that pause are the same incident
+(other loads that were already in flight) and are ignored. The rate settles just under where RepVue starts pushing back.
+A wait that times out on a fully loaded page (company not found, stale slug,
+missing control) is not throttling and leaves the rate alone.
+"""
+import asyncio, json, os, re, threading, time
+from contextlib import asynccontextmanager, contextmanager
+
+try:
+    import fcntl
+except ImportError:          # Windows
+    fcntl = None
+    import msvcrt
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from functions.instrumentation import record_event
+
+_ERROR_PAGE = re.compile(
+    r"too many requests|rate limit|access denied|temporarily unavailable|"
+    r"service unavailable|bad gateway|just a moment|attention required|\b(?:429|502|503)\b",
+    re.I)
+
+def _page_loaded(driver):
+    try:
+        return driver.execute_script("return document.readyState;") == "complete"
+    except WebDriverException:
+        return False
+
+def throttle_signal(driver=None, seconds=None, slow_seconds=None, error=None, status=None):
+    """
+    Reason string if a page load looks throttled, else None. `status` defaults to
+    the HTTP status carried by `error` (requests/httpx HTTPStatusError-style).
+    """
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status in (429, 503):
+        return f"http {status}"
+    if isinstance(error, TimeoutException):
+        # only a page that never finished loading; a wait for content on a loaded page is a miss
+        if driver is None or not _page_loaded(driver):
+            return "timeout"
+    elif error is not None and any("Timeout" in c.__name__ for c in type(error).__mro__):
+        return "timeout"     # requests / httpx / asyncio timeouts
+    if driver is not None:
+        try:
+            url = driver.current_url
+            title = driver.title or ""
+        except WebDriverException:
+            url, title = "", ""
+        if "/login" in url:
+            return "login redirect"
+        if _ERROR_PAGE.search(title):
+            return "error page"
+    if slow_seconds and seconds is not None and seconds > slow_seconds:
+        return "slow"
+    return None
+
+class RateLimiter:
+    """
+    Token bucket whose rate adapts to throttling. Thread-safe; with `state_file`
+    the bucket lives in that file (under an OS file lock) and is shared by every
+    process pointing at it.
+    """
+
+    def __init__(self, rate=1.0, burst=3, min_rate=0.05, max_rate=5.0, slow_seconds=12.0,
+                 backoff=0.5, step=0.05, recover_after=10, cooldown=5.0, max_cooldown=300.0,
+                 state_file=None):
+        self.burst = burst
+        self.min_rate, self.max_rate = min_rate, max_rate
+        self.slow_seconds = slow_seconds
+        self.backoff, self.step, self.recover_after = backoff, step, recover_after
+        self.cooldown, self.max_cooldown = cooldown, max_cooldown
+        self.state_file = state_file
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0, "reasons": {}}
+        self._lock = threading.Lock()
+        self._state = {"rate": rate, "tokens": float(burst), "ts": time.time(),
+                       "paused_until": 0.0, "strikes": 0, "clean": 0}
+
+    # ---- state (in memory, or in state_file for cross-process use) ----
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if not self.state_file:
+                yield self._state
+                return
+            with open(f"{self.state_file}.lock", "a+") as lf:
+                if fcntl:
+                    fcntl.flock(lf, fcntl.LOCK_EX)
+                else:
+                    lf.seek(0)
+                    msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    try:
+                        with open(self.state_file, encoding="utf-8") as f:
+                            self._state = {**self._state, **json.load(f)}
+                    except (OSError, ValueError):
+                        pass
+                    yield self._state
+                    tmp = f"{self.state_file}.tmp"
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        json.dump(self._state, f)
+                    os.replace(tmp, self.state_file)
+                finally:
+                    if fcntl:
+                        fcntl.flock(lf, fcntl.LOCK_UN)
+                    else:
+                        lf.seek(0)
+                        msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @property
+    def rate(self):
+        with self._locked() as st:
+            return st["rate"]
+
+    # ---- bucket ----
+    def _take(self):
+        """Take a token if one is available (returns 0), else the seconds to wait before retrying."""
+        with self._locked() as st:
+            now = time.time()
+            if now < st["paused_until"]:
+                st["ts"] = now    # no refill while paused
+                return st["paused_until"] - now
+            st["tokens"] = min(self.burst, st["tokens"] + (now - st["ts"]) * st["rate"])
+            st["ts"] = now
+            if st["tokens"] >= 1:
+                st["tokens"] -= 1
+                return 0
+            return (1 - st["tokens"]) / st["rate"]
+
+    def _acquired(self, start):
+        waited = time.monotonic() - start
+        with self._lock:
+            self.stats["acquired"] += 1
+            self.stats["waited_seconds"] += waited
+        return waited
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds waited."""
+        start = time.monotonic()
+        while delay := self._take():
+            time.sleep(min(delay, 1.0))
+        return self._acquired(start)
+
+    async def acquire_async(self):
+        """acquire() for asyncio code: waits without blocking the event loop."""
+        start = time.monotonic()
+        while delay := self._take():
+            await asyncio.sleep(min(delay, 1.0))
+        return self._acquired(start)
+
+    def report(self, reason=None, what="page"):
+        """Feed back the outcome of one request: None = clean, else the throttling reason."""
+        with self._locked() as st:
+            if reason and time.time() < st["paused_until"]:
+                return       # same incident, already backed off for it
+            if reason:
+                st["rate"] = max(self.min_rate, st["rate"] * self.backoff)
+                st["strikes"] += 1
+                st["clean"] = 0
+                pause = min(self.max_cooldown, self.cooldown * 2 ** (st["strikes"] - 1))
+                st["paused_until"] = max(st["paused_until"], time.time() + pause)
+                st["tokens"] = 0.0
+            else:
+                st["strikes"] = 0
+                st["clean"] += 1
+                if st["clean"] >= self.recover_after:
+                    st["clean"] = 0
+                    st["rate"] = min(self.max_rate, st["rate"] + self.step)
+            rate = st["rate"]
+            if reason:
+                self.stats["throttled"] += 1
+                self.stats["reasons"][reason] = self.stats["reasons"].get(reason, 0) + 1
+        if reason:
+            record_event("throttled", what=what, reason=reason, rate=round(rate, 3))
+
+    @contextmanager
+    def limit(self, driver=None, what="page"):
+        """
+        with limiter.limit(driver, "search") as load: ...   -- take a token, time the block
+        and report throttling signals (exceptions are reported and re-raised). Set
+        load["status"] to an HTTP status to have 429/503 counted, and load["seconds"]
+        to the time of the page load itself when the block also waits for elements
+        (a fallback wait for a missing element is not a slow page).
+        """
+        self.acquire()
+        start, load = time.monotonic(), {}
+        try:
+            yield load
+        except Exception as e:
+            self.report(throttle_signal(driver, error=e), what)
+            raise
+        self.report(throttle_signal(driver, load.get("seconds", time.monotonic() - start), self.slow_seconds,
+                                    status=load.get("status")), what)
+
+    @asynccontextmanager
+    async def limit_async(self, what="http"):
+        """`async with limiter.limit_async("http") as load:` -- limit() for browserless asyncio requests."""
+        await self.acquire_async()
+        start, load = time.monotonic(), {}
+        try:
+            yield load
+        except Exception as e:
+            self.report(throttle_signal(error=e), what)
+            raise
+        self.report(throttle_signal(None, time.monotonic() - start, self.slow_seconds,
+                                    status=load.get("status")), what)
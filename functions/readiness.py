@@ -0,0 +1,50 @@
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# One in-page predicate per signal: true as soon as the data the next scraper reads exists.
+SIGNALS = {
+    "general_info": """
+        return !!document.querySelector("div[class*='_currentCount'], div[class*='__stars'], div[class*='_ratings_employees']");
+    """,
+    "performance": """
+        return [...document.querySelectorAll("div[class*='performance-table']")]
+          .some(el => /category score/i.test(el.textContent || ""));
+    """,
+    "salaries": """
+        return [...document.querySelectorAll("a[href^='/companies/'][href*='/salaries/']")]
+          .some(a => /salary data from/i.test(a.textContent || ""));
+    """,
+    # No resource finished in the last `arguments[0]` ms and the document is loaded
+    "network_idle": """
+        if (document.readyState !== "complete") return false;
+        const quiet = arguments[0] || 500;
+        const ends = performance.getEntriesByType("resource").map(e => e.responseEnd);
+        const last = ends.length ? Math.max(...ends) : 0;
+        return performance.now() - last >= quiet;
+    """,
+}
+
+def wait_ready(driver, *signals, timeout=10, poll=0.1, idle_ms=500):
+    """
+    Block until ANY of `signals` is true, or until `timeout`.
+    Returns (ready, seconds_waited); never raises on timeout so the scraper's
+    own fallbacks still get their chance.
+    """
+    unknown = [s for s in signals if s not in SIGNALS]
+    if unknown:
+        raise ValueError(f"Unknown readiness signal(s): {unknown}; expected one of {sorted(SIGNALS)}")
+
+    script = "const checks = [" + ",".join(
+        f"(function(){{ {SIGNALS[s]} }}).apply(null, arguments)" for s in signals
+    ) + "]; return checks.some(Boolean);"
+
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(
+            lambda d: d.execute_script(script, idle_ms)
+        )
+        ready = True
+    except TimeoutException:
+        ready = False
+    return ready, round(time.monotonic() - start, 3)
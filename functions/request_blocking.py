@@ -0,0 +1,96 @@
+import json
+from dataclasses import dataclass, field
+from typing import List, Dict, Any
+
+# Nothing the scrapers read comes from these; patterns use CDP's '*' wildcard syntax.
+# Resource types (CDP Network.ResourceType names) -> URL patterns that block them.
+RESOURCE_TYPE_PATTERNS = {
+    "Image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "Font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "Media": ["*.mp4", "*.webm", "*.mp3", "*.m3u8"],
+    "Stylesheet": ["*.css"],
+}
+DEFAULT_BLOCKED_TYPES = ["Image", "Font", "Media"]
+
+# analytics / ads / chat widgets
+TRACKER_URLS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*segment.io*", "*segment.com*", "*intercom.io*", "*intercomcdn.com*",
+    "*fullstory.com*", "*mixpanel.com*", "*amplitude.com*", "*clarity.ms*", "*linkedin.com/px*",
+]
+
+@dataclass
+class BlockProfile:
+    """Opt-in request blocking for make_driver(block_profile=...)."""
+    resource_types: List[str] = field(default_factory=lambda: list(DEFAULT_BLOCKED_TYPES))  # keys of RESOURCE_TYPE_PATTERNS
+    url_patterns: List[str] = field(default_factory=lambda: list(TRACKER_URLS))             # blocked on top of the types
+    block_images: bool = True          # content-settings pref, on top of the URL patterns
+    block_notifications: bool = True
+    record: bool = True                # keep performance logs so page_weight() can report
+
+    def blocked_urls(self) -> List[str]:
+        unknown = set(self.resource_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types {sorted(unknown)}; choose from {sorted(RESOURCE_TYPE_PATTERNS)}")
+        types = [p for t in self.resource_types for p in RESOURCE_TYPE_PATTERNS[t]]
+        return list(dict.fromkeys(types + self.url_patterns))
+
+    def prefs(self) -> Dict[str, Any]:
+        p = {}
+        if self.block_images:
+            p["profile.managed_default_content_settings.images"] = 2
+        if self.block_notifications:
+            p["profile.managed_default_content_settings.notifications"] = 2
+        return p
+
+def apply_blocking(driver, profile: BlockProfile) -> None:
+    """Install the URL block list on a running driver (CDP)."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.blocked_urls()})
+
+def page_weight(driver, messages=None) -> Dict[str, Any]:
+    """
+    Summarise network traffic from Chrome's performance log (drained here unless
+    already-read CDP `messages` are passed in). Needs goog:loggingPrefs
+    performance=ALL, which make_driver sets when recording.
+    Returns {requests, bytes, blocked_requests, blocked_by_type, bytes_by_type}.
+    """
+    if messages is None:
+        messages = [json.loads(e["message"])["message"] for e in driver.get_log("performance")]
+    requests, types, finished, blocked = {}, {}, {}, {}
+    for msg in messages:
+        method, params = msg.get("method"), msg.get("params", {})
+        rid = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            requests[rid] = params.get("request", {}).get("url")
+            types[rid] = params.get("type", "Other")
+        elif method == "Network.responseReceived":
+            types[rid] = params.get("type", types.get(rid, "Other"))
+        elif method == "Network.loadingFinished":
+            finished[rid] = params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked[rid] = params.get("type", types.get(rid, "Other"))
+
+    bytes_by_type, blocked_by_type = {}, {}
+    for rid, n in finished.items():
+        t = types.get(rid, "Other")
+        bytes_by_type[t] = bytes_by_type.get(t, 0) + int(n)
+    for t in blocked.values():
+        blocked_by_type[t] = blocked_by_type.get(t, 0) + 1
+
+    return {
+        "requests": len(finished),
+        "bytes": sum(bytes_by_type.values()),
+        "blocked_requests": len(blocked),
+        "blocked_by_type": blocked_by_type,
+        "bytes_by_type": bytes_by_type,
+    }
+
+def savings(baseline: Dict[str, Any], blocked: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare page_weight() of the same page loaded without and with a BlockProfile."""
+    return {
+        "requests_saved": baseline["requests"] - blocked["requests"],
+        "bytes_saved": baseline["bytes"] - blocked["bytes"],
+        "bytes_saved_pct": round(100 * (1 - blocked["bytes"] / baseline["bytes"]), 1) if baseline["bytes"] else None,
+    }
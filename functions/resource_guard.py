@@ -0,0 +1,118 @@
+import threading, time
+from dataclasses import dataclass
+from typing import Optional
+
+import psutil
+
+from functions.driver_lifecycle import chrome_processes
+
+@dataclass
+class ResourceLimits:
+    """Hard limits for one worker's chromedriver + Chrome process tree (None = unchecked)."""
+    max_rss_mb: Optional[float] = 3000
+    max_cpu_pct: Optional[float] = None    # summed over the tree (100 = one core) ...
+    cpu_window: int = 15                   # ... sustained for this many consecutive samples
+    max_processes: Optional[int] = 60
+    max_zombies: Optional[int] = 5
+    interval: float = 2.0                  # seconds between samples
+
+class ResourceGuard:
+    """
+    Watchdog thread for a RepVueService's browser. Samples the process tree every
+    `interval`; when a limit is broken it kills the whole tree (which unblocks any
+    WebDriver call in progress) and sets `tripped` so the service can restart the
+    driver and hand the company back to the queue.
+    """
+
+    def __init__(self, limits: ResourceLimits, get_driver):
+        self.limits = limits
+        self.get_driver = get_driver
+        self.tripped: Optional[str] = None
+        self.last = {}
+        self.peak = {"rss_mb": 0.0, "cpu_pct": 0.0, "processes": 0}
+        self._procs = {}            # pid -> psutil.Process, kept so cpu_percent() has a baseline
+        self._hot = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        procs = chrome_processes(self.get_driver())
+        rss, cpu, zombies = 0, 0.0, 0
+        alive = {}
+        for p in procs:
+            p = self._procs.get(p.pid, p)
+            alive[p.pid] = p
+            try:
+                if p.status() == psutil.STATUS_ZOMBIE:
+                    zombies += 1
+                    continue
+                rss += p.memory_info().rss
+                cpu += p.cpu_percent(None)
+            except psutil.Error:
+                continue
+        self._procs = alive
+        s = {"rss_mb": round(rss / 2**20, 1), "cpu_pct": round(cpu, 1),
+             "processes": len(procs), "zombies": zombies}
+        self.last = s
+        for k in self.peak:
+            self.peak[k] = max(self.peak[k], s[k])
+        return s
+
+    def check(self, s):
+        lim = self.limits
+        if lim.max_rss_mb and s["rss_mb"] > lim.max_rss_mb:
+            return f"RSS {s['rss_mb']} MB > {lim.max_rss_mb}"
+        if lim.max_processes and s["processes"] > lim.max_processes:
+            return f"{s['processes']} processes > {lim.max_processes}"
+        if lim.max_zombies is not None and s["zombies"] > lim.max_zombies:
+            return f"{s['zombies']} zombie children > {lim.max_zombies}"
+        if lim.max_cpu_pct:
+            self._hot = self._hot + 1 if s["cpu_pct"] > lim.max_cpu_pct else 0
+            if self._hot >= lim.cpu_window:
+                return f"CPU {s['cpu_pct']}% > {lim.max_cpu_pct} for {self._hot} samples"
+        return None
+
+    def kill(self):
+        procs = chrome_processes(self.get_driver())
+        for p in reversed(procs):           # children first, chromedriver last
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(procs, timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.limits.interval):
+            if self.tripped:
+                continue
+            try:
+                reason = self.check(self.sample())
+            except Exception:
+                continue
+            if reason:
+                self.tripped = reason
+                self.kill()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="repvue-resource-guard", daemon=True)
+            self._thread.start()
+        return self
+
+    def reset(self):
+        """After the driver was replaced: clear the trip and per-driver state."""
+        self.tripped = None
+        self._procs, self._hot = {}, 0
+
+    def usage(self):
+        """Latest sample + peaks since the last take_usage(), for scrape metrics."""
+        return {**{f"chrome_{k}": v for k, v in self.last.items()},
+                **{f"chrome_peak_{k}": v for k, v in self.peak.items()}}
+
+    def take_usage(self):
+        u = self.usage()
+        self.peak = {k: 0 for k in self.peak}
+        return u
+
+    def stop(self):
+        self._stop.set()
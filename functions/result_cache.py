@@ -0,0 +1,76 @@
+import threading, time
+from concurrent.futures import Future
+
+class ResultCache:
+    """
+    In-memory TTL cache of scrape_company() results with request coalescing:
+    while a key is being scraped, every caller asking for it gets the same Future.
+    Results that are not "OK"/"Not Found" are kept for `failed_ttl` only, so a
+    transient failure is retried soon instead of being served for an hour.
+    """
+
+    def __init__(self, ttl=3600, failed_ttl=60, max_entries=10000):
+        self.ttl = ttl
+        self.failed_ttl = failed_ttl
+        self.max_entries = max_entries
+        self._data = {}        # key -> (stored_at, result)
+        self._inflight = {}    # key -> Future
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def _fresh(self, entry):
+        ts, res = entry
+        ttl = self.ttl if res.get("status") in ("OK", "Not Found", "Unchanged") else self.failed_ttl
+        return time.time() - ts <= ttl
+
+    def get(self, key):
+        """(result, age_seconds) if cached and fresh, else (None, None)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or not self._fresh(entry):
+                return None, None
+            return entry[1], round(time.time() - entry[0], 1)
+
+    def put(self, key, result):
+        with self._lock:
+            self._data[key] = (time.time(), result)
+            if len(self._data) > self.max_entries:
+                # drop the oldest tenth
+                for k, _ in sorted(self._data.items(), key=lambda kv: kv[1][0])[: self.max_entries // 10]:
+                    del self._data[k]
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def get_or_submit(self, key, submit, refresh=False):
+        """
+        Future for `key`: already resolved if cached, the in-flight one if someone is
+        scraping it, else a new one from submit() whose result is cached when done.
+        Returns (future, source) with source "cache" | "coalesced" | "scrape".
+        """
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.stats["coalesced"] += 1
+                return fut, "coalesced"
+            entry = self._data.get(key)
+            if entry is not None and not refresh and self._fresh(entry):
+                self.stats["hits"] += 1
+                fut = Future()
+                fut.set_result(entry[1])
+                return fut, "cache"
+            self.stats["misses"] += 1
+            fut = submit()
+            self._inflight[key] = fut
+
+        def _done(f):
+            with self._lock:
+                self._inflight.pop(key, None)
+            if not f.cancelled() and f.exception() is None:
+                self.put(key, f.result())
+        fut.add_done_callback(_done)
+        return fut, "scrape"
+
+    def __len__(self):
+        return len(self._data)
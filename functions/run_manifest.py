@@ -0,0 +1,81 @@
+import atexit, json, os, threading, time
+
+PENDING, DONE, NOT_FOUND, FAILED = "pending", "done", "not-found", "failed"
+
+# scrape_company() status -> manifest state
+_STATE_OF = {"OK": DONE, "Unchanged": DONE, "Not Found": NOT_FOUND}
+
+class RunManifest:
+    """
+    Per-company progress for a multi-company run, rewritten atomically:
+    {"companies": {"<name>": {"state", "attempts", "seconds", "error", "updated_at"}}}
+    Updates are saved at most every `save_every` seconds (plus flush() / exit); after a
+    crash --resume redoes at most that window, and the sinks keep the latest row per company.
+    """
+
+    def __init__(self, path, save_every=10.0):
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.time()
+        self.companies = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.companies = json.load(f).get("companies", {})
+        except (OSError, ValueError):
+            pass
+        atexit.register(self.flush)
+
+    def _save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": time.time(), "companies": self.companies}, f, indent=1)
+        os.replace(tmp, self.path)
+        self._dirty, self._saved_at = False, time.time()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def start(self, companies, resume=False, max_attempts=3):
+        """
+        Register `companies` and return the ones this run should process.
+        resume=False resets everything to pending. resume=True skips done/not-found
+        companies and anything that already failed `max_attempts` times.
+        """
+        with self._lock:
+            if not resume:
+                self.companies = {}
+            todo = []
+            for c in companies:
+                entry = self.companies.setdefault(c, {"state": PENDING, "attempts": 0})
+                if entry["state"] in (DONE, NOT_FOUND):
+                    continue
+                if entry["state"] == FAILED and entry["attempts"] >= max_attempts:
+                    continue
+                todo.append(c)
+            self._save()
+        return todo
+
+    def mark(self, result):
+        with self._lock:
+            entry = self.companies.setdefault(result["company"], {"state": PENDING, "attempts": 0})
+            entry.update({
+                "state": _STATE_OF.get(result["status"], FAILED),
+                "attempts": entry.get("attempts", 0) + 1,
+                "seconds": result.get("seconds"),
+                "error": result.get("error"),
+                "updated_at": time.time(),
+            })
+            self._dirty = True
+            if time.time() - self._saved_at >= self.save_every:
+                self._save()
+
+    def counts(self):
+        with self._lock:
+            out = {}
+            for e in self.companies.values():
+                out[e["state"]] = out.get(e["state"], 0) + 1
+            return out
@@ -0,0 +1,125 @@
+import time
+from selenium.common.exceptions import WebDriverException, TimeoutException
+
+from functions.rate_limit import throttle_signal
+
+# One-shot extractor for /companies/<slug>/salaries/<role>.
+# Returns null until the page has rendered its heading, so it doubles as the readiness probe.
+ROLE_DETAIL_JS = r"""
+if (document.readyState !== "complete") return null;
+const norm = s => (s||"").replace(/\s+/g," ").trim();
+const h1 = document.querySelector("h1");
+if (!h1) return null;
+
+function tokenToInt(tok){
+  tok = (tok||"").replace(/[$,\s]/g,"").toLowerCase();
+  const m = tok.match(/^(\d+(?:\.\d+)?)([kmb])?$/);
+  if (!m) return null;
+  let n = parseFloat(m[1]);
+  n *= {k:1e3, m:1e6, b:1e9}[m[2]] || 1;
+  return Math.round(n);
+}
+function money(s){
+  const toks = (s||"").match(/\$\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?\s*[kmb]?/gi) || [];
+  const vals = toks.map(tokenToInt).filter(Number.isFinite);
+  if (!vals.length) return null;
+  return {min: Math.min(...vals), max: Math.max(...vals), raw: norm(s)};
+}
+
+// label -> value pairs: <span|dt|h5|h6>label</...> followed by its value element
+const fields = {};
+for (const lab of document.querySelectorAll("span, dt, h5, h6, p")) {
+  const label = norm(lab.textContent);
+  const v = lab.nextElementSibling;
+  if (!v || !label || label.length > 40 || v.children.length > 3) continue;
+  const value = norm(v.textContent);
+  if (!value || value.length > 60 || fields[label] !== undefined) continue;
+  fields[label] = value;
+}
+
+const moneyFields = {};
+for (const [k, v] of Object.entries(fields)) {
+  const m = money(v);
+  if (m) moneyFields[k] = m;
+}
+
+// any tables (e.g. pay by level / location)
+const tables = [...document.querySelectorAll("table")].map(t =>
+  [...t.querySelectorAll("tr")].map(tr => [...tr.children].map(td => norm(td.textContent))));
+
+let quota = null;
+const pb = document.querySelector("[role='progressbar'][aria-valuenow]");
+if (pb) quota = parseFloat(pb.getAttribute("aria-valuenow"));
+
+return {title: norm(h1.textContent), fields, money: moneyFields, tables,
+        quota_attainment_pct: quota, url: location.href};
+"""
+
+def crawl_role_details(driver, rows, tabs=4, timeout=20, poll=0.2, on_new_tab=None, limiter=None):
+    """
+    Load every row's `link` in up to `tabs` tabs of the same (logged-in) browser at
+    once and attach the extracted detail dict as row["detail"] (None on timeout).
+    Navigation is started with location.href so it doesn't block; tabs are polled
+    round-robin and each one takes the next link as soon as its page is extracted.
+    on_new_tab() runs with each new tab focused, before its first load (CDP state
+    such as the URL block list is per tab). With a RateLimiter every tab load takes a
+    token first and its outcome is reported. Returns `rows`.
+    """
+    todo = [r for r in rows if r.get("link")]
+    if not todo:
+        return rows
+
+    origin = driver.current_window_handle
+    pending = list(reversed(todo))
+    busy = {}     # handle -> (row, started_at, last_result)
+    handles = []
+    try:
+        for _ in range(min(tabs, len(todo))):
+            driver.switch_to.new_window("tab")
+            handles.append(driver.current_window_handle)
+            if on_new_tab is not None:
+                on_new_tab()
+
+        def assign(h):
+            row = pending.pop()
+            if limiter is not None:
+                limiter.acquire()
+            driver.switch_to.window(h)
+            driver.execute_script("window.location.href = arguments[0];", row["link"])
+            busy[h] = (row, time.monotonic(), None)
+
+        for h in handles:
+            if pending:
+                assign(h)
+
+        while busy:
+            for h in list(busy):
+                row, started, last = busy[h]
+                driver.switch_to.window(h)
+                try:
+                    cur = driver.execute_script(ROLE_DETAIL_JS)
+                except WebDriverException:
+                    cur = None   # page mid-navigation
+                # the URL check guards against reading the previous page in this tab
+                done = cur is not None and cur == last and cur.get("url", "").rstrip("/").endswith(
+                    row["link"].rstrip("/").split("/")[-1])
+                if done or time.monotonic() - started > timeout:
+                    row["detail"] = cur if done else None
+                    if limiter is not None:
+                        limiter.report(throttle_signal(driver, time.monotonic() - started, limiter.slow_seconds,
+                                                       error=None if done else TimeoutException()), "role_detail")
+                    del busy[h]
+                    if pending:
+                        assign(h)
+                else:
+                    busy[h] = (row, started, cur)
+            time.sleep(poll)
+    finally:
+        for h in handles:
+            try:
+                driver.switch_to.window(h)
+                driver.close()
+            except WebDriverException:
+                pass
+        driver.switch_to.window(origin)
+    return rows
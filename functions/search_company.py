@@ -2,11 +2,21 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, WebDriverException
+from selenium.common.exceptions import (TimeoutException, ElementClickInterceptedException, WebDriverException,
+                                        StaleElementReferenceException)
 import time, re
+from functions.instrumentation import record_event
+from functions.exceptions import CompanyNotFound
+from functions.locator_registry import shared_locator_registry
 
-class CompanyNotFound(Exception):
-    pass
+SEARCH_CONTROL_LOCATORS = [
+    (By.CSS_SELECTOR, "div[class*='searchMobile']"),
+    (By.XPATH,
+     "//*[self::a or self::div or self::button]"
+     "[contains(@class,'Navbar_search') or "
+     " normalize-space()='Search Companies' or "
+     " .//span[normalize-space()='Search Companies']]")
+]
 
 def _safe_click(driver, el):
     try:
@@ -22,31 +32,59 @@ def _safe_click(driver, el):
 def _open_search(driver, timeout):
     w = WebDriverWait(driver, timeout)
     w.until(lambda d: d.execute_script("return document.readyState") == "complete")
-    for how, sel in [
-        (By.CSS_SELECTOR, "div[class*='searchMobile']"),
-        (By.XPATH,
-         "//*[self::a or self::div or self::button]"
-         "[contains(@class,'Navbar_search') or "
-         " normalize-space()='Search Companies' or "
-         " .//span[normalize-space()='Search Companies']]")
-    ]:
-        try:
-            el = w.until(EC.presence_of_element_located((how, sel)))
-            _safe_click(driver, el)
-            return
-        except TimeoutException:
-            continue
+    # whichever control worked last time is tried first
+    _, el = shared_locator_registry().first(
+        "search.open", SEARCH_CONTROL_LOCATORS,
+        lambda how, sel: w.until(EC.presence_of_element_located((how, sel))))
+    if el is not None:
+        _safe_click(driver, el)
+        return
     raise TimeoutException("Search control not found (searchMobile / Search Companies)")
 
-def search_company(driver, wait: WebDriverWait, company_name: str, timeout: int = 10):
+# "results" once a result link matches the query; "empty" only when the dialog shows an empty
+# state, has no links and its input holds the query (not a leftover from before the debounce)
+RESULTS_STATE_JS = r"""
+const q = arguments[0];
+const dlg = document.querySelector("div[role='dialog']");
+if (!dlg) return null;
+const links = [...dlg.querySelectorAll("a[href*='/companies/']")];
+if (links.some(a => (a.textContent || "").toLowerCase().includes(q))) return "results";
+const input = dlg.querySelector("input");
+if (input && input.value.trim().toLowerCase() === q && !links.length
+    && /no results|no companies/i.test(dlg.textContent || "")) return "empty";
+return null;
+"""
+
+def _on_company(url, path):
+    return re.search(re.escape(path) + r"(?:[/?#]|$)", url) is not None
+
+def _replaced(el, text):
+    """Condition: `el` detached, or its text changed (React may reuse the node across routes)."""
+    def check(_):
+        try:
+            return el.get_attribute("textContent") != text
+        except StaleElementReferenceException:
+            return True
+    return check
+
+def search_company(driver, wait: WebDriverWait, company_name: str, timeout: int = 10, settle: float = 1.0,
+                   load: dict = None):
+    """
+    Search RepVue and open the best-matching company; returns its URL.
+    `load` (a RateLimiter.limit() dict) gets the page-load time in "seconds": the
+    /companies load and the company page after the click, not the dialog waits.
+    """
+    loading = 0.0
     w = WebDriverWait(driver, timeout)
     name = company_name.strip()
     lname = name.lower()
 
     # Ensure we are on /companies
     if "/companies" not in driver.current_url:
+        start = time.monotonic()
         driver.get("https://www.repvue.com/companies")
         w.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        loading += time.monotonic() - start
 
     # Open search dialog
     _open_search(driver, timeout)
@@ -63,10 +101,31 @@ def search_company(driver, wait: WebDriverWait, company_name: str, timeout: int
     except TimeoutException:
         raise TimeoutException("Search input not found")
 
-    # Type query & give SPA a moment
+    # Type query
     search_input.clear()
     search_input.send_keys(company_name)
-    time.sleep(0.8)
+
+    # Wait until the result list reflects the query instead of sleeping for the SPA's
+    # debounce. An empty state must hold for `settle` seconds before it counts: a
+    # "not found" is cached, so a stale one must not slip through.
+    empty_since = None
+
+    def results_state(d):
+        nonlocal empty_since
+        state = d.execute_script(RESULTS_STATE_JS, lname)
+        if state != "empty":
+            empty_since = None
+            return state
+        empty_since = empty_since or time.monotonic()
+        return state if time.monotonic() - empty_since >= settle else None
+
+    try:
+        state = WebDriverWait(driver, timeout, poll_frequency=0.2).until(results_state)
+    except TimeoutException:
+        record_event("wait_timeout", where="search_results", seconds=timeout)
+        state = None  # fall through to the generic result wait below
+    if state == "empty":
+        raise CompanyNotFound(f"Company not found on RepVue: {company_name}")
 
     # Wait for at least one result row to appear
     w.until(EC.presence_of_element_located((
@@ -105,16 +164,32 @@ def search_company(driver, wait: WebDriverWait, company_name: str, timeout: int
         starts = [el for el in results if (first_line(el) or "").lower().startswith(lname)]
         if starts:
             target = starts[0]
+            record_event("fallback", where="search_company", to="prefix_match")
         else:
             # Last resort: first result containing the name anywhere
             contains = [el for el in results if lname in (el.get_attribute("textContent") or "").lower()]
             target = contains[0] if contains else None
+            record_event("fallback", where="search_company", to="contains_match")
 
     if not target:
         raise CompanyNotFound(f"Company not found on RepVue: {company_name}")
 
+    # The previous company's page may still be on screen (so the URL already contains
+    # /companies/): wait for the route to reach the clicked company and for the old
+    # heading to be replaced, or the readiness checks would read the old company's DOM
+    m = re.search(r"/companies/([^/?#]+)", target.get_attribute("href") or "")
+    path = f"/companies/{m.group(1)}" if m else "/companies/"
+    old_url = driver.current_url
+    old_heading = driver.find_elements(By.TAG_NAME, "h1")
+    old_text = old_heading[0].get_attribute("textContent") if old_heading else None
+
+    start = time.monotonic()
     _safe_click(driver, target)
 
     # Confirm navigation
-    w.until(EC.url_contains("/companies/"))
+    w.until(lambda d: _on_company(d.current_url, path))
+    if old_heading and not _on_company(old_url, path):
+        w.until(_replaced(old_heading[0], old_text))
+    if load is not None:
+        load["seconds"] = loading + time.monotonic() - start
     return driver.current_url
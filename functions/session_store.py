@@ -0,0 +1,82 @@
+import json, os, threading, time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+BASE_URL = "https://www.repvue.com"
+DEFAULT_SESSION_FILE = os.getenv("REPVUE_SESSION_FILE", ".repvue_session.json")
+
+# Workers in one process share the file; serialize writes
+_lock = threading.Lock()
+
+def save_session(driver, path=DEFAULT_SESSION_FILE):
+    """Persist cookies + localStorage of a logged-in driver (atomic write, 0600)."""
+    state = {
+        "saved_at": time.time(),
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(
+            "const o = {}; for (let i = 0; i < localStorage.length; i++) {"
+            " const k = localStorage.key(i); o[k] = localStorage.getItem(k); } return o;"
+        ) or {},
+    }
+    with _lock:
+        tmp = f"{path}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+def load_session(path=DEFAULT_SESSION_FILE, max_age=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if max_age is not None and time.time() - state.get("saved_at", 0) > max_age:
+        return None
+    return state
+
+def restore_session(driver, path=DEFAULT_SESSION_FILE, max_age=None):
+    """Load a saved session into `driver`. Returns False if there was nothing usable to restore."""
+    state = load_session(path, max_age)
+    if not state or not state.get("cookies"):
+        return False
+
+    # Cookies/localStorage can only be set for the current origin; robots.txt is the cheapest page there
+    driver.get(f"{BASE_URL}/robots.txt")
+
+    now = time.time()
+    for c in state["cookies"]:
+        if c.get("expiry") and c["expiry"] < now:
+            continue
+        c = {k: v for k, v in c.items() if k in ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")}
+        if "expiry" in c:
+            c["expiry"] = int(c["expiry"])
+        if c.get("sameSite") not in ("Strict", "Lax", "None"):
+            c.pop("sameSite", None)
+        try:
+            driver.add_cookie(c)
+        except WebDriverException:
+            pass  # cookie for another subdomain, etc.
+
+    ls = state.get("local_storage") or {}
+    if ls:
+        driver.execute_script(
+            "for (const [k, v] of Object.entries(arguments[0])) localStorage.setItem(k, v);", ls
+        )
+    return True
+
+def session_is_valid(driver, timeout=8):
+    """
+    Cheap check: open the dashboard and see whether we get bounced to /login.
+    Returns as soon as either the app navbar renders or the redirect happens.
+    """
+    driver.get(f"{BASE_URL}/dashboard")
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: "/login" in d.current_url
+            or d.find_elements(By.CSS_SELECTOR, "div[class*='searchMobile'], div[class*='Navbar']")
+        )
+    except TimeoutException:
+        return False
+    return "/login" not in driver.current_url
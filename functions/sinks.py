@@ -0,0 +1,221 @@
+"""
+Streaming result sinks: every company is persisted the moment it is scraped,
+so a crash mid-run only loses the company in flight.
+
+    sink = make_sink("jsonl", "repvue_out")   # or "parquet"
+    sink.write(result)                        # result = scrape_company(...) dict
+    sink.close()
+
+scrape_company(..., on_rows=sink.write_rows) streams salary/review rows into the
+sink while the lists load; write(result) then adds the rest of the company.
+    finalize_excel("repvue_out", "repvue_data.xlsx")
+
+Layout (jsonl/parquet): one table per kind -- info, perf, salaries, reviews, summary --
+with `company`, `slug` and `scraped_at` on every row. The "sqlite" sink stores the
+same data normalized with history, see functions.sqlite_store.
+"""
+import glob, itertools, json, os, re, threading, time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from functions.excel_export import summary_row, write_workbook
+from functions import sqlite_store
+
+TABLES = ("info", "perf", "salaries", "reviews", "summary")
+META_COLS = ("company", "slug", "scraped_at")
+
+
+def _rows(result):
+    """Split one scrape_company() result into {table: [rows]}."""
+    meta = {
+        "company": result["company"],
+        "slug": result.get("slug"),
+        "scraped_at": result.get("scraped_at") or _now(),
+    }
+    info = result.get("info") or {}
+    return {
+        "info": [{**meta, **info}] if info else [],
+        "perf": [{**meta, **r} for r in (result.get("perf") or [])],
+        "salaries": [{**meta, **r} for r in (result.get("salaries") or [])],
+        "reviews": [{**meta, **r} for r in (result.get("reviews") or [])],
+        "summary": [{**meta, **summary_row(result)}],
+    }
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class JsonlSink:
+    """
+    Appends to <out_dir>/<table>.jsonl.
+    flush_every: flush file buffers every N companies (1 = after each one).
+    fsync:       also fsync on each flush (survives power loss, costs a disk sync).
+    """
+
+    def __init__(self, out_dir, flush_every=1, fsync=False):
+        self.out_dir = out_dir
+        self.flush_every = max(1, flush_every)
+        self.fsync = fsync
+        os.makedirs(out_dir, exist_ok=True)
+        self._files = {t: open(os.path.join(out_dir, f"{t}.jsonl"), "a", encoding="utf-8") for t in TABLES}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def write(self, result):
+        rows = _rows(result)
+        with self._lock:
+            for table, items in rows.items():
+                f = self._files[table]
+                for r in items:
+                    f.write(json.dumps(r, ensure_ascii=False, default=str) + "\n")
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+
+    def write_rows(self, table, meta, rows):
+        """Append rows of a company still being scraped; meta = {company, slug, scraped_at}."""
+        with self._lock:
+            f = self._files[table]
+            for r in rows:
+                f.write(json.dumps({**meta, **r}, ensure_ascii=False, default=str) + "\n")
+
+    def _flush(self):
+        for f in self._files.values():
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._pending = 0
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            for f in self._files.values():
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetSink:
+    """
+    Writes one small file per company and table (and per streamed batch of rows):
+    <out_dir>/<table>/company=<name>/part-<epoch_ms>-<n>.parquet
+    Needs pyarrow (or fastparquet), which is not in requirements.txt.
+    """
+
+    def __init__(self, out_dir, fsync=False, **_):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("ParquetSink needs pyarrow: pip install pyarrow (or use the jsonl sink)")
+        self.out_dir = out_dir
+        self.fsync = fsync
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def write(self, result):
+        for table, items in _rows(result).items():
+            self._write_part(table, result["company"], items)
+
+    def write_rows(self, table, meta, rows):
+        """One more part file per batch of a company still being scraped; meta = {company, slug, scraped_at}."""
+        self._write_part(table, meta["company"], [{**meta, **r} for r in rows])
+
+    def _write_part(self, table, company, items):
+        if not items:
+            return
+        part = re.sub(r"[^\w.-]+", "_", company).strip("_") or "unknown"
+        d = os.path.join(self.out_dir, table, f"company={part}")
+        os.makedirs(d, exist_ok=True)
+        with self._lock:
+            path = os.path.join(d, f"part-{int(time.time() * 1000)}-{next(self._seq)}.parquet")
+            pd.DataFrame(items).to_parquet(f"{path}.tmp", index=False)
+            if self.fsync:
+                with open(f"{path}.tmp", "rb") as f:
+                    os.fsync(f.fileno())
+            os.replace(f"{path}.tmp", path)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+SINKS = {"jsonl": JsonlSink, "parquet": ParquetSink, "sqlite": sqlite_store.SqliteSink}
+
+
+def make_sink(kind, out_dir, **kwargs):
+    try:
+        return SINKS[kind](out_dir, **kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown sink '{kind}'; expected one of {sorted(SINKS)}")
+
+
+def read_table(out_dir, table):
+    """Load one table back from any sink format as a DataFrame."""
+    db_path = os.path.join(out_dir, sqlite_store.DB_NAME)
+    if os.path.exists(db_path):
+        return sqlite_store.read_table(db_path, table)
+    path = os.path.join(out_dir, f"{table}.jsonl")
+    if os.path.exists(path):
+        return pd.read_json(path, lines=True, dtype=False, convert_dates=False) if os.path.getsize(path) else pd.DataFrame()
+    files = sorted(glob.glob(os.path.join(out_dir, table, "company=*", "*.parquet")))
+    return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True) if files else pd.DataFrame()
+
+
+def load_results(out_dir, order=None):
+    """
+    Rebuild scrape_company()-style dicts from a sink directory (latest row set per company wins).
+    `order`: company names to sort by (e.g. the input list); others follow in scrape order.
+    """
+    tables = {t: read_table(out_dir, t) for t in TABLES}
+    summary = tables["summary"]
+    if summary.empty:
+        return []
+    summary = summary.sort_values("scraped_at", kind="stable")
+    # "Unchanged" (and "Failed") rows carry no perf/salaries: take the data from the last OK scrape
+    full = summary[summary["status"] == "OK"].drop_duplicates("company", keep="last")
+    data_ts = dict(zip(full["company"], full["scraped_at"]))
+    summary = summary.drop_duplicates("company", keep="last")
+    if order:
+        rank = {c: i for i, c in enumerate(order)}
+        summary = summary.sort_values("company", key=lambda s: s.map(lambda c: rank.get(c, len(rank))), kind="stable")
+
+    def rows_for(df, company, scraped_at):
+        # only rows written together with this summary row
+        if df.empty:
+            return []
+        df = df[(df["company"] == company) & (df["scraped_at"] == scraped_at)]
+        return df.drop(columns=[c for c in META_COLS if c in df.columns]).to_dict("records")
+
+    results = []
+    for row in summary.to_dict("records"):
+        company = row["company"]
+        ts = data_ts.get(company, row["scraped_at"])
+        info = rows_for(tables["info"], company, ts)
+        results.append({
+            "company": company,
+            "status": row.get("status"),
+            "info": info[0] if info else {},
+            "perf": rows_for(tables["perf"], company, ts),
+            "salaries": rows_for(tables["salaries"], company, ts),
+            "reviews": rows_for(tables["reviews"], company, ts),
+            "summary": {k: v for k, v in row.items() if k not in ("slug", "scraped_at")},
+        })
+    return results
+
+
+def finalize_excel(out_dir, output_file, order=None):
+    """Build the usual Info/Perf/Salaries/Summary workbook from a sink directory."""
+    results = load_results(out_dir, order)
+    write_workbook(results, output_file)
+    return len(results)
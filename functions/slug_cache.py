@@ -0,0 +1,81 @@
+import json, os, threading, time
+
+DEFAULT_SLUG_CACHE_FILE = os.getenv("REPVUE_SLUG_CACHE", ".repvue_slugs.json")
+
+class SlugCache:
+    """
+    Persistent company name -> slug map so search() can skip the search dialog.
+    Misses (CompanyNotFound) are cached too, with a shorter TTL.
+    File format: {"<lowercased name>": {"slug": "Salesforce" | null, "ts": <epoch>}}
+    """
+
+    def __init__(self, path=DEFAULT_SLUG_CACHE_FILE, ttl=30 * 86400, negative_ttl=86400):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _key(name):
+        return " ".join(name.split()).lower()
+
+    def lookup(self, name):
+        """Returns (hit, slug). hit=True with slug=None means a cached 'not found'."""
+        with self._lock:
+            entry = self._data.get(self._key(name))
+        if not entry:
+            return False, None
+        ttl = self.ttl if entry.get("slug") else self.negative_ttl
+        if time.time() - entry.get("ts", 0) > ttl:
+            return False, None
+        return True, entry.get("slug")
+
+    def put(self, name, slug):
+        with self._lock:
+            self._data[self._key(name)] = {"slug": slug, "ts": time.time()}
+            self._save()
+
+    def put_many(self, slugs):
+        """{name: slug} in one write (e.g. from a directory crawl)."""
+        now = time.time()
+        with self._lock:
+            for name, slug in slugs.items():
+                self._data[self._key(name)] = {"slug": slug, "ts": now}
+            self._save()
+
+    def put_missing(self, name):
+        self.put(name, None)
+
+    def invalidate(self, name):
+        with self._lock:
+            if self._data.pop(self._key(name), None) is not None:
+                self._save()
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+def shared_slug_cache(path=DEFAULT_SLUG_CACHE_FILE):
+    """One SlugCache per file per process, so parallel workers don't overwrite each other's entries."""
+    with _shared_lock:
+        if path not in _shared:
+            _shared[path] = SlugCache(path)
+        return _shared[path]
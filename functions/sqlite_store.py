@@ -0,0 +1,251 @@
+"""
+SQLite storage with snapshot history. Every scrape is stored under (slug, scraped_at),
+so past runs stay queryable without loading workbooks:
+
+    companies     slug PK, name, url, first_seen, last_scraped
+    scrapes       one row per scrape attempt (the Summary sheet, incl. not-found/failed)
+    general_info  (slug, scraped_at) PK
+    performance   (slug, scraped_at, category) PK
+    salaries      (slug, scraped_at, link) PK
+    reviews       (slug, scraped_at, link) PK
+
+Salary/review rows are streamed in while a company is still being scraped, so an
+attempt that fails or is requeued leaves rows without an OK `scrapes` row; the
+read helpers below only return rows of OK scrapes.
+
+Used as a sink (make_sink("sqlite", out_dir) -> <out_dir>/repvue.db) or directly:
+
+    db = connect("repvue_out/repvue.db")
+    company_history(db, "Salesforce")
+    role_salaries(db, "Account Executive", since="2026-01-01")
+"""
+import json, os, sqlite3, threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+DB_NAME = "repvue.db"
+
+# output dict key -> column
+INFO_COLS = {
+    "RepVue score": "repvue_score",
+    "star_rating": "star_rating",
+    "Employee ratings (N)": "employee_ratings",
+    "current_size": "current_size",
+    "trend_pct": "trend_pct",
+}
+PERF_COLS = ["category", "score", "industry_percentile", "industry_rank"]
+SALARY_COLS = [
+    "role", "ratings_count",
+    "median_base_pay", "median_base_pay_is_range", "median_base_pay_min", "median_base_pay_max",
+    "median_ote", "median_ote_is_range", "median_ote_min", "median_ote_max",
+    "top_performers", "top_performers_is_range", "top_performers_min", "top_performers_max",
+    "quota_attainment_pct", "link",
+    "detail",   # role page data from the role-detail tabs, as JSON text
+]
+REVIEW_COLS = ["link", "title", "rating", "date", "text"]
+SCRAPE_COLS = ["status", "url", "seconds", "wait_seconds", "worker", "error", "changed",
+               "chrome_rss_mb", "chrome_peak_rss_mb", "chrome_peak_cpu_pct"]
+
+_FK = "FOREIGN KEY (slug) REFERENCES companies (slug)"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS companies (
+    slug TEXT PRIMARY KEY, name TEXT, url TEXT, first_seen TEXT, last_scraped TEXT
+);
+CREATE TABLE IF NOT EXISTS scrapes (
+    company TEXT NOT NULL, slug TEXT, scraped_at TEXT NOT NULL,
+    status TEXT, url TEXT, seconds REAL, wait_seconds REAL, worker INTEGER, error TEXT, changed TEXT,
+    chrome_rss_mb REAL, chrome_peak_rss_mb REAL, chrome_peak_cpu_pct REAL,
+    PRIMARY KEY (company, scraped_at), {_FK}
+);
+CREATE TABLE IF NOT EXISTS general_info (
+    slug TEXT NOT NULL, scraped_at TEXT NOT NULL,
+    {", ".join(f"{c} {'INTEGER' if c in ('employee_ratings', 'current_size') else 'REAL'}" for c in INFO_COLS.values())},
+    PRIMARY KEY (slug, scraped_at), {_FK}
+);
+CREATE TABLE IF NOT EXISTS performance (
+    slug TEXT NOT NULL, scraped_at TEXT NOT NULL,
+    category TEXT NOT NULL, score REAL, industry_percentile REAL, industry_rank INTEGER,
+    PRIMARY KEY (slug, scraped_at, category), {_FK}
+);
+CREATE TABLE IF NOT EXISTS salaries (
+    slug TEXT NOT NULL, scraped_at TEXT NOT NULL,
+    {", ".join(f"{c} {'TEXT NOT NULL' if c in ('role', 'link') else 'TEXT' if c == 'detail' else 'REAL'}" for c in SALARY_COLS)},
+    PRIMARY KEY (slug, scraped_at, link), {_FK}
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    slug TEXT NOT NULL, scraped_at TEXT NOT NULL,
+    link TEXT NOT NULL, title TEXT, rating REAL, date TEXT, text TEXT,
+    PRIMARY KEY (slug, scraped_at, link), {_FK}
+);
+CREATE INDEX IF NOT EXISTS ix_companies_name ON companies (name);
+CREATE INDEX IF NOT EXISTS ix_scrapes_slug ON scrapes (slug, scraped_at);
+CREATE INDEX IF NOT EXISTS ix_general_info_date ON general_info (scraped_at);
+CREATE INDEX IF NOT EXISTS ix_performance_date ON performance (scraped_at);
+CREATE INDEX IF NOT EXISTS ix_salaries_role ON salaries (role, scraped_at);
+CREATE INDEX IF NOT EXISTS ix_salaries_date ON salaries (scraped_at);
+CREATE INDEX IF NOT EXISTS ix_reviews_date ON reviews (scraped_at);
+"""
+
+
+def connect(path):
+    db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    db.execute("PRAGMA foreign_keys=ON")
+    return db
+
+
+def _upsert_sql(table, cols, key):
+    updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c not in key) or f"{key[0]}={key[0]}"
+    return (f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+            f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}")
+
+
+class SqliteSink:
+    """
+    Sink interface (write/write_rows/close) over connect(). Rows are upserted in one transaction per
+    `batch_size` companies; re-writing the same (slug, scraped_at) replaces it.
+    """
+
+    def __init__(self, out_dir, batch_size=1, **_):
+        os.makedirs(out_dir, exist_ok=True)
+        self.db = connect(os.path.join(out_dir, DB_NAME))
+        self.batch_size = max(1, batch_size)
+        self._batch = []
+        self._lock = threading.Lock()
+
+    def write(self, result):
+        with self._lock:
+            self._batch.append((result, result.get("scraped_at") or datetime.now(timezone.utc).isoformat(timespec="seconds")))
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def write_rows(self, table, meta, rows):
+        """Upsert salary/review rows of a company still being scraped; meta = {company, slug, scraped_at}."""
+        slug, ts = meta.get("slug"), meta["scraped_at"]
+        if not slug:
+            return
+        if table == "salaries":
+            sql, items = _upsert_sql("salaries", ["slug", "scraped_at", *SALARY_COLS], ["slug", "scraped_at", "link"]), \
+                [_salary_row(slug, ts, r) for r in rows if r.get("role")]
+        elif table == "reviews":
+            sql, items = _upsert_sql("reviews", ["slug", "scraped_at", *REVIEW_COLS], ["slug", "scraped_at", "link"]), \
+                [(slug, ts, *(r.get(c) for c in REVIEW_COLS)) for r in rows if r.get("link")]
+        else:
+            raise ValueError(f"write_rows only streams salaries/reviews, not '{table}'")
+        with self._lock, self.db:
+            self.db.execute(_COMPANY_SQL, (slug, meta["company"], None, ts, ts))
+            self.db.executemany(sql, items)
+
+    def _flush(self):
+        if not self._batch:
+            return
+        companies, scrapes, info, perf, salaries, reviews = [], [], [], [], [], []
+        for res, ts in self._batch:
+            slug = res.get("slug")
+            scrapes.append((res["company"], slug, ts, *(_plain(res.get(c)) for c in SCRAPE_COLS)))
+            if not slug:
+                continue
+            companies.append((slug, res["company"], res.get("url"), ts, ts))
+            if res.get("info"):
+                info.append((slug, ts, *(res["info"].get(k) for k in INFO_COLS)))
+            perf += [(slug, ts, *(r.get(c) for c in PERF_COLS)) for r in res.get("perf") or [] if r.get("category")]
+            salaries += [_salary_row(slug, ts, r) for r in res.get("salaries") or [] if r.get("role")]
+            reviews += [(slug, ts, *(r.get(c) for c in REVIEW_COLS)) for r in res.get("reviews") or [] if r.get("link")]
+
+        with self.db:  # one transaction
+            self.db.executemany(_COMPANY_SQL, companies)
+            self.db.executemany(_upsert_sql("scrapes", ["company", "slug", "scraped_at", *SCRAPE_COLS],
+                                            ["company", "scraped_at"]), scrapes)
+            self.db.executemany(_upsert_sql("general_info", ["slug", "scraped_at", *INFO_COLS.values()],
+                                            ["slug", "scraped_at"]), info)
+            self.db.executemany(_upsert_sql("performance", ["slug", "scraped_at", *PERF_COLS],
+                                            ["slug", "scraped_at", "category"]), perf)
+            self.db.executemany(_upsert_sql("salaries", ["slug", "scraped_at", *SALARY_COLS],
+                                            ["slug", "scraped_at", "link"]), salaries)
+            self.db.executemany(_upsert_sql("reviews", ["slug", "scraped_at", *REVIEW_COLS],
+                                            ["slug", "scraped_at", "link"]), reviews)
+        self._batch = []
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_COMPANY_SQL = ("INSERT INTO companies (slug, name, url, first_seen, last_scraped) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (slug) DO UPDATE SET name=excluded.name, url=COALESCE(excluded.url, url), "
+                "last_scraped=excluded.last_scraped")
+
+
+def _salary_row(slug, ts, row):
+    return (slug, ts, *(_salary_link(row) if c == "link" else _json(row.get(c)) if c == "detail" else row.get(c)
+                        for c in SALARY_COLS))
+
+
+def _salary_link(row):
+    """Salary rows are keyed by their role link (as everywhere else); '#<role>' when a row has none."""
+    return row.get("link") or f"#{row['role']}"
+
+
+def _json(v):
+    return json.dumps(v, ensure_ascii=False) if v is not None else None
+
+
+def _plain(v):
+    if isinstance(v, (list, tuple)):
+        return ",".join(map(str, v))
+    return v
+
+
+# ---------- reads ----------
+
+def read_table(db_path, table):
+    """
+    A sink table (info/perf/salaries/reviews/summary) shaped like the JSONL sink's, so
+    sinks.load_results/finalize_excel work on a SQLite directory too.
+    """
+    db = sqlite3.connect(db_path)
+    try:
+        if table == "summary":
+            return pd.read_sql("SELECT * FROM scrapes ORDER BY scraped_at", db)
+        src, cols = {
+            "info": ("general_info", [f'g.{c} AS "{k}"' for k, c in INFO_COLS.items()]),
+            "perf": ("performance", [f"g.{c}" for c in PERF_COLS]),
+            "salaries": ("salaries", [f"g.{c}" for c in SALARY_COLS]),
+            "reviews": ("reviews", [f"g.{c}" for c in REVIEW_COLS]),
+        }[table]
+        return pd.read_sql(
+            f"SELECT s.company, g.slug, g.scraped_at, {', '.join(cols)} FROM {src} g "
+            f"JOIN scrapes s ON s.slug = g.slug AND s.scraped_at = g.scraped_at "
+            f"ORDER BY g.scraped_at", db)
+    finally:
+        db.close()
+
+
+_OK_SCRAPE = "JOIN scrapes s ON s.slug = g.slug AND s.scraped_at = g.scraped_at AND s.status = 'OK'"
+
+
+def company_history(db, slug):
+    """general_info snapshots for one company, oldest first."""
+    return pd.read_sql(f"SELECT g.* FROM general_info g {_OK_SCRAPE} WHERE g.slug = ? ORDER BY g.scraped_at",
+                       db, params=(slug,))
+
+
+def role_salaries(db, role, since=None):
+    """One role across companies and time (uses ix_salaries_role)."""
+    sql = f"SELECT g.* FROM salaries g {_OK_SCRAPE} WHERE g.role = ?"
+    params = [role]
+    if since:
+        sql += " AND g.scraped_at >= ?"
+        params.append(since)
+    return pd.read_sql(sql + " ORDER BY g.scraped_at", db, params=params)
@@ -0,0 +1,88 @@
+import queue, threading, time
+from concurrent.futures import Future
+
+_STOP = object()
+
+class WarmPool:
+    """
+    Long-lived counterpart of worker_pool.run_pool for a server: N threads, each
+    holding one logged-in RepVueService, serving submit(item) -> Future for as
+    long as the process lives.
+
+    worker_init(worker_id) -> svc   as in run_pool; retried with a delay if it fails.
+    work(svc, item) -> dict         as in run_pool ("Requeue" goes back on the queue,
+                                    an exception fails the item and rebuilds the worker's service).
+    """
+
+    def __init__(self, worker_init, work, workers=2, max_requeues=2, restart_delay=10.0):
+        self.worker_init = worker_init
+        self.work = work
+        self.workers = workers
+        self.max_requeues = max_requeues
+        self.restart_delay = restart_delay
+        self.ready = {}          # worker_id -> bool (logged in and serving)
+        self._jobs = queue.Queue()
+        self._threads = []
+
+    def start(self):
+        """Start the workers; logins happen in the background."""
+        for w in range(max(1, self.workers)):
+            t = threading.Thread(target=self._worker, args=(w,), name=f"repvue-warm-{w}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def submit(self, item):
+        fut = Future()
+        self._jobs.put((item, fut, 0))
+        return fut
+
+    def pending(self):
+        return self._jobs.qsize()
+
+    def _start_service(self, worker_id):
+        while True:
+            try:
+                return self.worker_init(worker_id)
+            except Exception as e:
+                print(f"[warm {worker_id}] failed to start: {e!r}; retrying in {self.restart_delay}s")
+                time.sleep(self.restart_delay)
+
+    def _worker(self, worker_id):
+        svc = self._start_service(worker_id)
+        self.ready[worker_id] = True
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is _STOP:
+                    return
+                item, fut, requeues = job
+                if requeues == 0 and not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    res = self.work(svc, item)
+                except Exception as e:
+                    fut.set_result({"company": item, "status": "Failed", "error": repr(e), "worker": worker_id})
+                    print(f"[warm {worker_id}] restarting after error: {e!r}")
+                    self.ready[worker_id] = False
+                    svc.close()
+                    svc = self._start_service(worker_id)
+                    self.ready[worker_id] = True
+                    continue
+                if res.get("status") == "Requeue" and requeues < self.max_requeues:
+                    self._jobs.put((item, fut, requeues + 1))
+                    continue
+                if res.get("status") == "Requeue":
+                    res["status"] = "Failed"
+                res.setdefault("worker", worker_id)
+                fut.set_result(res)
+        finally:
+            self.ready[worker_id] = False
+            svc.close()
+
+    def stop(self):
+        for _ in self._threads:
+            self._jobs.put(_STOP)
+        for t in self._threads:
+            t.join()
+
@@ -0,0 +1,240 @@
+"""
+Leased work queue for spreading company scrapes over many worker processes on one host.
+
+    q = make_queue("sqlite:///shared/repvue_queue.db")
+    q.put(companies)                                   # once, from anywhere
+    run_queue_worker(q, start_worker, scrape_company, workers=4, on_result=sink.write)   # in every worker process
+
+A worker leases an item for `visibility` seconds and keeps extending the lease
+while it works (heartbeat). The item is acked only after its result went to the
+sink, so delivery is at-least-once: if a process dies its leases expire and the
+items are handed to the next worker that asks. A reclaimed lease counts as an
+attempt; after `max_attempts` the item is parked as "dead".
+
+Backends implement put/lease/extend/ack/release/counts; QUEUES maps URL schemes
+to them. The SQLite backend (and the SQLite sink queue mode writes to) runs in WAL
+mode, which needs every process on the same machine: WAL's shared-memory index
+does not work over NFS/SMB or any other disk shared between hosts. Queue mode is
+therefore single-host; spreading it over machines needs a server-backed queue
+registered in QUEUES and a server-backed sink.
+"""
+import json, os, socket, sqlite3, threading, time, uuid
+
+PENDING, LEASED, DONE, FAILED, DEAD = "pending", "leased", "done", "failed", "dead"
+
+# scrape_company() status -> final queue state (anything else is retried)
+_FINAL = {"OK": DONE, "Unchanged": DONE, "Not Found": DONE}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT, lease_token TEXT, lease_until REAL,
+    last_status TEXT, last_error TEXT, updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_state ON jobs (state, available_at);
+"""
+
+
+class SqliteQueue:
+    """Work queue in one SQLite file; every lease runs in a BEGIN IMMEDIATE transaction."""
+
+    def __init__(self, path, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._db().executescript(SCHEMA)
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def put(self, items, reset=False):
+        """Enqueue items (duplicates are ignored); reset=True also re-opens finished ones."""
+        now = time.time()
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany("INSERT OR IGNORE INTO jobs (item, updated_at) VALUES (?, ?)",
+                           [(json.dumps(i), now) for i in items])
+            if reset:
+                db.executemany("UPDATE jobs SET state='pending', attempts=0, available_at=0, updated_at=? "
+                               "WHERE item=? AND state != 'leased'", [(now, json.dumps(i)) for i in items])
+
+    def lease(self, owner, n=1, visibility=300):
+        """
+        Up to `n` items that are pending or whose lease expired: [(id, token, item, attempt)].
+        Expired items past max_attempts are moved to "dead" instead.
+        """
+        now = time.time()
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("UPDATE jobs SET state='dead', last_error=COALESCE(last_error, 'lease expired'), "
+                       "updated_at=? WHERE state='leased' AND lease_until < ? AND attempts >= ?",
+                       (now, now, self.max_attempts))
+            rows = db.execute(
+                "SELECT id, item, attempts FROM jobs WHERE (state='pending' AND available_at <= ?) "
+                "OR (state='leased' AND lease_until < ?) ORDER BY id LIMIT ?", (now, now, n)).fetchall()
+            out = []
+            for job_id, item, attempts in rows:
+                token = uuid.uuid4().hex
+                db.execute("UPDATE jobs SET state='leased', attempts=attempts+1, lease_owner=?, lease_token=?, "
+                           "lease_until=?, updated_at=? WHERE id=?",
+                           (owner, token, now + visibility, now, job_id))
+                out.append((job_id, token, json.loads(item), attempts + 1))
+        return out
+
+    def extend(self, job_id, token, visibility=300):
+        """Push the lease out again; False if it was lost (expired and taken by someone else)."""
+        now = time.time()
+        cur = self._db().execute("UPDATE jobs SET lease_until=?, updated_at=? WHERE id=? AND lease_token=? "
+                                 "AND state='leased'", (now + visibility, now, job_id, token))
+        return cur.rowcount == 1
+
+    def ack(self, job_id, token, status, error=None):
+        """Finish an item: done for final statuses, otherwise back to pending (or failed after max_attempts)."""
+        now = time.time()
+        state = _FINAL.get(status)
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT attempts FROM jobs WHERE id=? AND lease_token=?", (job_id, token)).fetchone()
+            if row is None:
+                return False
+            if state is None:
+                state = FAILED if row[0] >= self.max_attempts else PENDING
+            db.execute("UPDATE jobs SET state=?, lease_token=NULL, lease_until=NULL, last_status=?, last_error=?, "
+                       "updated_at=? WHERE id=?", (state, status, error, now, job_id))
+        return True
+
+    def release(self, job_id, token, delay=0.0):
+        """Give an item back without a result (e.g. "Requeue"); it is available again after `delay`."""
+        now = time.time()
+        cur = self._db().execute(
+            "UPDATE jobs SET state=CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "last_status='Requeue', lease_token=NULL, lease_until=NULL, available_at=?, updated_at=? "
+            "WHERE id=? AND lease_token=?", (self.max_attempts, now + delay, now, job_id, token))
+        return cur.rowcount == 1
+
+    def counts(self):
+        return dict(self._db().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+    def drained(self):
+        """Nothing pending or in flight (dead/failed/done only)."""
+        return not self._db().execute(
+            "SELECT 1 FROM jobs WHERE state IN ('pending', 'leased') LIMIT 1").fetchone()
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+QUEUES = {"sqlite": SqliteQueue}
+
+def make_queue(url, **kwargs):
+    """'sqlite:///path/to/queue.db' (or a bare path) -> queue backend."""
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        scheme, rest = "sqlite", url
+    try:
+        cls = QUEUES[scheme]
+    except KeyError:
+        raise ValueError(f"Unknown queue backend {scheme!r}; choose from {sorted(QUEUES)}")
+    return cls(rest, **kwargs)
+
+
+def node_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_queue_worker(queue, worker_init, work, workers=2, on_result=None, visibility=300, poll=5.0,
+                     exit_when_drained=True):
+    """
+    Serve `queue` with N threads on this node, same contract as worker_pool.run_pool:
+    worker_init(worker_id) -> svc, work(svc, item) -> result dict, on_result(result).
+    on_result runs before the ack, so a result is never lost, only possibly written twice.
+    Returns the number of items this node finished.
+    """
+    owner = node_id()
+    held = {}                 # job_id -> token, leases being worked on by this node
+    lock = threading.Lock()
+    stop = threading.Event()
+    finished = [0]
+
+    def _heartbeat():
+        while not stop.wait(visibility / 3):
+            with lock:
+                leases = list(held.items())
+            for job_id, token in leases:
+                if not queue.extend(job_id, token, visibility):
+                    print(f"[{owner}] lost lease on job {job_id}")
+
+    def _worker(worker_id):
+        try:
+            svc = worker_init(worker_id)
+        except Exception as e:
+            print(f"[{owner} worker {worker_id}] failed to start: {e!r}")
+            return
+        try:
+            while True:
+                leased = queue.lease(f"{owner}/{worker_id}", 1, visibility)
+                if not leased:
+                    if exit_when_drained and queue.drained():
+                        return
+                    time.sleep(poll)
+                    continue
+                job_id, token, item, attempt = leased[0]
+                with lock:
+                    held[job_id] = token
+                try:
+                    try:
+                        res = work(svc, item)
+                    except Exception as e:
+                        res = {"company": item, "status": "Failed", "error": repr(e)}
+                        broken = True
+                    else:
+                        broken = False
+
+                    if res.get("status") == "Requeue":
+                        queue.release(job_id, token)
+                        continue
+                    res.setdefault("worker", worker_id)
+                    res["attempt"] = attempt
+                    if on_result:
+                        with lock:
+                            on_result(res)
+                    queue.ack(job_id, token, res["status"], res.get("error"))
+                    with lock:
+                        finished[0] += 1
+                finally:
+                    with lock:
+                        held.pop(job_id, None)
+                if broken:
+                    print(f"[{owner} worker {worker_id}] stopping after error: {res['error']}")
+                    return
+        finally:
+            svc.close()
+
+    hb = threading.Thread(target=_heartbeat, name="repvue-queue-heartbeat", daemon=True)
+    hb.start()
+    threads = [threading.Thread(target=_worker, args=(w,), name=f"repvue-queue-worker-{w}", daemon=True)
+               for w in range(max(1, workers))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    return finished[0]
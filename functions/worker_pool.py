@@ -0,0 +1,88 @@
+import queue, threading
+
+from functions.exceptions import NoWorkerStarted
+
+def run_pool(items, worker_init, work, workers=4, on_result=None, max_requeues=2):
+    """
+    Run `work(svc, item)` over `items` with N workers pulling from one shared queue.
+
+    worker_init(worker_id) -> svc   builds one logged-in RepVueService per worker
+                                    (each one owns its own Chrome).
+    work(svc, item) -> dict         must not raise for per-item failures. A result with
+                                    status "Requeue" puts the item back on the queue
+                                    (at most `max_requeues` times, then it is "Failed").
+                                    If work() does raise, the worker's service is
+                                    considered broken: the item fails and the worker stops.
+    on_result(index, result)        optional callback, called as items complete.
+
+    Returns results in the same order as `items`. Items no worker could take
+    (e.g. every worker failed to start or died) come back with status "Failed" and
+    are passed to on_result too. Raises NoWorkerStarted, after reporting them, when
+    not a single worker started.
+    """
+    jobs = queue.Queue()
+    for i, item in enumerate(items):
+        jobs.put((i, item))
+
+    results = [None] * len(items)
+    requeues = [0] * len(items)
+    lock = threading.Lock()
+    started = []
+
+    def _worker(worker_id):
+        try:
+            svc = worker_init(worker_id)
+        except Exception as e:
+            print(f"[worker {worker_id}] failed to start: {e!r}")
+            return
+        started.append(worker_id)
+        try:
+            while True:
+                try:
+                    i, item = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    res = work(svc, item)
+                except Exception as e:
+                    res = {"company": item, "status": "Failed", "error": repr(e)}
+                    broken = True
+                else:
+                    broken = False
+
+                if res.get("status") == "Requeue":
+                    with lock:
+                        requeues[i] += 1
+                        again = requeues[i] <= max_requeues
+                    if again:
+                        jobs.put((i, item))
+                        continue
+                    res["status"] = "Failed"
+
+                res.setdefault("worker", worker_id)
+                results[i] = res
+                if on_result:
+                    with lock:
+                        on_result(i, res)
+                if broken:
+                    print(f"[worker {worker_id}] stopping after error: {res['error']}")
+                    return
+        finally:
+            svc.close()
+
+    n = max(1, min(workers, len(items)))
+    threads = [threading.Thread(target=_worker, args=(w,), name=f"repvue-worker-{w}", daemon=True)
+               for w in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for i, item in enumerate(items):
+        if results[i] is None:
+            results[i] = {"company": item, "status": "Failed", "error": "no worker available"}
+            if on_result:
+                on_result(i, results[i])
+    if items and not started:
+        raise NoWorkerStarted(f"none of {n} worker(s) started; {len(items)} item(s) not scraped")
+    return results
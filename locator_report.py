@@ -0,0 +1,17 @@
+import sys
+from functions.locator_registry import LocatorRegistry, DEFAULT_LOCATOR_FILE
+
+# Usage: python locator_report.py [stats.json]
+# Seconds lost per field to fallback locators that timed out, worst field first.
+if __name__ == "__main__":
+    registry = LocatorRegistry(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOCATOR_FILE)
+    rows = registry.waste_report()
+    if not rows:
+        print("No locator stats recorded yet.")
+    field = None
+    for r in rows:
+        if r["field"] != field:
+            field = r["field"]
+            print(f"\n{field}")
+        print(f"  {r['waste_seconds']:>9.1f}s wasted  {r['hits']:>6} hits  {r['misses']:>6} misses  "
+              f"rate {r['rate']:.2f}  {r['locator'][:90]}")
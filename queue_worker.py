@@ -0,0 +1,72 @@
+import os
+import argparse
+import functools
+from scraper_multiple_companies import (companies, start_worker, report, workers, sink_dir,
+                                        sink_fsync, fingerprint_max_age, output_file)
+from functions.work_queue import make_queue, run_queue_worker
+from functions.company_scrape import scrape_company
+from functions.sinks import make_sink, finalize_excel
+from functions.fingerprint import SqliteFingerprintStore
+from functions.sqlite_store import DB_NAME
+
+# Shared queue every worker process points at. Single host only: the SQLite queue and sink
+# run in WAL mode, which does not work on a disk shared between machines (see functions/work_queue.py)
+queue_url = os.getenv("REPVUE_QUEUE", f"sqlite://{os.path.join(sink_dir, 'queue.db')}")
+
+# Every process writes into the same store, and only SQLite takes concurrent writers safely:
+# appends from several processes to one JSONL file can interleave inside a record
+sink_kind = os.getenv("REPVUE_SINK", "sqlite")
+
+# Seconds a leased company stays invisible to other workers (extended while it is being scraped)
+visibility = float(os.getenv("REPVUE_LEASE_SECONDS", "300"))
+
+# Usage:
+#   python queue_worker.py enqueue [--file names.txt] [--reset]   # once
+#   python queue_worker.py work [--keep-polling]                   # in each worker process (same host)
+#   python queue_worker.py status
+#   python queue_worker.py finalize                                # workbook from the shared sink
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RepVue scraping by several processes on one host over a leased work queue.")
+    parser.add_argument("command", choices=["enqueue", "work", "status", "finalize"])
+    parser.add_argument("--file", help="enqueue: one company name per line (default: the list in scraper_multiple_companies.py)")
+    parser.add_argument("--reset", action="store_true", help="enqueue: re-open companies that already finished")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--keep-polling", action="store_true", help="work: wait for new items instead of exiting when drained")
+    parser.add_argument("--force", action="store_true", help="work: ignore content fingerprints")
+    args = parser.parse_args()
+
+    queue = make_queue(queue_url, max_attempts=args.max_attempts)
+
+    if args.command == "enqueue":
+        names = companies
+        if args.file:
+            with open(args.file, encoding="utf-8") as f:
+                names = [line.strip() for line in f if line.strip()]
+        queue.put(names, reset=args.reset)
+        print(f"Enqueued {len(names)} companies -> {queue.counts()}")
+
+    elif args.command == "status":
+        print(queue.counts())
+
+    elif args.command == "finalize":
+        n = finalize_excel(sink_dir, output_file)
+        print(f"Wrote {n} companies to {output_file}")
+
+    else:
+        if sink_kind != "sqlite":
+            parser.error(f"queue mode needs REPVUE_SINK=sqlite (got '{sink_kind}'): several processes share the sink")
+        os.makedirs(sink_dir, exist_ok=True)
+        # in the shared database, not fingerprints.json: each process would overwrite the others' file
+        fingerprints = SqliteFingerprintStore(os.path.join(sink_dir, DB_NAME), max_age=fingerprint_max_age)
+        with make_sink(sink_kind, sink_dir, fsync=sink_fsync) as sink:
+            work = functools.partial(scrape_company, fingerprints=fingerprints, force=args.force,
+                                     on_rows=sink.write_rows)
+
+            def on_result(res: dict) -> None:
+                sink.write(res)
+                report(res)
+
+            n = run_queue_worker(queue, start_worker, work, workers=workers, on_result=on_result,
+                                 visibility=visibility, exit_when_drained=not args.keep_polling)
+        fingerprints.flush()
+        print(f"\nThis process finished {n} companies. Queue: {queue.counts()}")
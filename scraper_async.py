@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import asyncio
+from dotenv import load_dotenv
+from service import RepVueService
+from functions.sinks import make_sink, finalize_excel
+from functions.rate_limit import RateLimiter
+
+# -------------------- CONFIG --------------------
+load_dotenv()
+
+email_id = os.getenv("REPVUE_EMAIL")
+password = os.getenv("REPVUE_PASS")
+
+# Usage: python scraper_async.py slug [slug ...]
+slugs = sys.argv[1:] or ["Salesforce"]
+output_file = "repvue_data.xlsx"
+sink_dir = os.getenv("REPVUE_OUT_DIR", "repvue_out")
+concurrency = int(os.getenv("REPVUE_CONCURRENCY", "20"))
+
+# Requests per second across all in-flight GETs, as in scraper_multiple_companies.py (0 = unpaced)
+rate = float(os.getenv("REPVUE_RATE", "1.0"))
+rate_limiter = RateLimiter(rate=rate, max_rate=float(os.getenv("REPVUE_MAX_RATE", "5.0")),
+                           state_file=os.getenv("REPVUE_RATE_FILE")) if rate else None
+
+
+# -------------------- MAIN --------------------
+async def run(svc: RepVueService, sink) -> list:
+    """HTTP pass over every slug; returns the ones that still need the browser."""
+    need_browser = []
+    async for res in svc.scrape_many(slugs, concurrency=concurrency):
+        if res["missing"]:
+            need_browser.append(res["slug"])
+            continue
+        sink.write({"company": res["slug"], "slug": res["slug"], "status": "OK",
+                    "url": f"https://www.repvue.com/companies/{res['slug']}",
+                    "info": res["info"], "perf": res["perf"], "salaries": res["salaries"],
+                    "fast": ["info", "perf", "salaries"]})
+        print(f"✅ {res['slug']} (http)")
+    return need_browser
+
+
+if __name__ == "__main__":
+    start = time.time()
+    with RepVueService.create(rate_limiter=rate_limiter) as svc, make_sink("jsonl", sink_dir) as sink:
+        svc.ensure_login(email_id, password)
+        leftovers = asyncio.run(run(svc, sink))
+
+        # Whatever the pages didn't carry goes through the browser, one by one
+        for slug in leftovers:
+            t = time.time()
+            try:
+                data = svc.scrape_fast(slug)
+                sink.write({"company": slug, "slug": slug, "status": "OK",
+                            "url": f"https://www.repvue.com/companies/{slug}",
+                            "info": data["info"], "perf": data["perf"], "salaries": data["salaries"],
+                            "fast": data["fast"], "seconds": round(time.time() - t, 2)})
+                print(f"✅ {slug} (browser fallback)")
+            except Exception as e:
+                sink.write({"company": slug, "slug": slug, "status": "Failed", "error": repr(e)})
+                print(f"⚠️  {slug} failed: {e!r}")
+
+    finalize_excel(sink_dir, output_file, order=slugs)
+    print(f"\n✅ {len(slugs)} companies in {round(time.time() - start, 2)}s. Data saved to {output_file}")
@@ -1,4 +1,4 @@
-import os,time
+import os
 
 from dotenv import load_dotenv
 from service import RepVueService
@@ -16,8 +16,7 @@ Company_name = "Salesforce"
 try:
 
     with RepVueService.create() as svc:
-        svc.driver.get("https://www.repvue.com/login")
-        svc.login(email_id, password)
+        svc.ensure_login(email_id, password)
 
         try:
             url = svc.search(Company_name)
@@ -28,7 +27,7 @@ try:
 
         
 
-        time.sleep(4)
+        svc.ready("general_info", "performance")
 
         info = svc.general_info()
         perf = svc.performance()
@@ -36,6 +35,7 @@ try:
         slug = svc.company_slug()
         if slug:
             svc.go("salaries",slug)
+            svc.ready("salaries")
             salaries = svc.salaries()
 
         print(info)
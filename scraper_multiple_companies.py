@@ -1,9 +1,21 @@
 import os
+import sys
 import time
-import pandas as pd
+import argparse
+import functools
 from dotenv import load_dotenv
 from service import RepVueService
-from functions.exceptions import CompanyNotFound
+from functions.worker_pool import run_pool
+from functions.company_scrape import scrape_company
+from functions.sinks import make_sink, finalize_excel
+from functions.run_manifest import RunManifest
+from functions.request_blocking import BlockProfile
+from functions.instrumentation import Tracer
+from functions.fingerprint import FingerprintStore
+from functions.resource_guard import ResourceLimits
+from functions.rate_limit import RateLimiter
+from functions.company_directory import load_catalog
+from functions.exceptions import NoWorkerStarted
 
 # -------------------- CONFIG --------------------
 load_dotenv()
@@ -16,135 +28,144 @@ companies = [
 ]
 output_file = "repvue_data.xlsx"
 
+# Number of parallel browsers (each worker runs its own Chrome)
+workers = int(os.getenv("REPVUE_WORKERS", "4"))
 
-# -------------------- HELPERS --------------------
-def safe_sheet_name(name: str, suffix: str) -> str:
-    """Excel sheet name limit is 31 chars and cannot contain: : \ / ? * [ ]"""
-    bad = {":", "\\", "/", "?", "*", "[", "]"}
-    base = "".join(ch for ch in name if ch not in bad).strip() or "Sheet"
-    max_base_len = 31 - (len(suffix) + 1)
-    base = base[:max_base_len] if max_base_len > 0 else base[:25]
-    return f"{base}_{suffix}"
-
-
-def to_df_info(info: dict) -> pd.DataFrame:
-    return pd.DataFrame([info]) if info else pd.DataFrame()
-
-
-def to_df_perf(perf) -> pd.DataFrame:
-    """Flatten list[dict] or dict to table."""
-    if not perf:
-        return pd.DataFrame()
-    if isinstance(perf, list):
-        df = pd.DataFrame(perf)
-    elif isinstance(perf, dict):
-        df = pd.DataFrame([perf])
-    else:
-        return pd.DataFrame()
+# Streaming output: every company is appended here as soon as it is scraped
+sink_kind = os.getenv("REPVUE_SINK", "jsonl")          # jsonl | parquet | sqlite
+sink_dir = os.getenv("REPVUE_OUT_DIR", "repvue_out")
+sink_fsync = os.getenv("REPVUE_FSYNC", "0") == "1"
+
+# Skip images/fonts/media/analytics in every worker's Chrome
+block_requests = os.getenv("REPVUE_BLOCK_REQUESTS", "0") == "1"
+block_types = [t for t in os.getenv("REPVUE_BLOCK_TYPES", "Image,Font,Media").split(",") if t]
+
+# Fill fields the DOM scrape left empty from the SPA's JSON API responses
+capture_network = os.getenv("REPVUE_CAPTURE_NETWORK", "0") == "1"
+
+# Fetch pages over plain HTTP with the browser's cookies; Chrome only as fallback
+fast_path = os.getenv("REPVUE_FAST_PATH", "0") == "1"
+
+# Restart each worker's Chrome after N pages / above an RSS limit (0 = never)
+max_pages = int(os.getenv("REPVUE_MAX_PAGES", "200")) or None
+max_rss_mb = float(os.getenv("REPVUE_MAX_RSS_MB", "1500")) or None
+
+# Hard per-worker limits: Chrome is killed + restarted and the company re-queued
+limits = ResourceLimits(max_rss_mb=float(os.getenv("REPVUE_KILL_RSS_MB", "3000")))
 
-    order = ["category", "score", "industry_percentile", "industry_rank"]
-    cols = [c for c in order if c in df.columns] + [c for c in df.columns if c not in order]
-    return df[cols]
+# Follow every salary role link, N tabs at a time (0 = overview table only)
+role_detail_tabs = int(os.getenv("REPVUE_ROLE_TABS", "0"))
 
+# Also scrape each company's reviews page (streamed through load-more/scroll)
+scrape_reviews = os.getenv("REPVUE_REVIEWS", "0") == "1"
 
-def to_df_salaries(salaries) -> pd.DataFrame:
-    """Handle list[list] or list[dict]."""
-    if not salaries:
-        return pd.DataFrame()
-    if isinstance(salaries[0], dict):
-        return pd.DataFrame(salaries)
-    return pd.DataFrame(salaries)
+# Page loads per second across all workers (adapts down when throttled, 0 = unlimited);
+# point REPVUE_RATE_FILE at a shared path to pace several processes together
+rate = float(os.getenv("REPVUE_RATE", "1.0"))
+rate_limiter = RateLimiter(rate=rate, max_rate=float(os.getenv("REPVUE_MAX_RATE", "5.0")),
+                           state_file=os.getenv("REPVUE_RATE_FILE")) if rate else None
+
+# Per-stage timing: spans -> <dir>/trace.jsonl, totals -> <dir>/metrics.prom
+trace_dir = os.getenv("REPVUE_TRACE_DIR")
+tracer = Tracer() if trace_dir else None
+
+# Content hashes per company between runs (skip unchanged companies unless --force)
+fingerprint_file = os.getenv("REPVUE_FINGERPRINTS", os.path.join(sink_dir, "fingerprints.json"))
+fingerprint_max_age = float(os.getenv("REPVUE_FINGERPRINT_MAX_DAYS", "7")) * 86400   # full pass at least this often
+
+# Per-company progress, used by --resume
+manifest_file = os.getenv("REPVUE_MANIFEST", os.path.join(sink_dir, "manifest.json"))
+
+
+# -------------------- HELPERS --------------------
+def start_worker(worker_id: int) -> RepVueService:
+    svc = RepVueService.create(block_profile=BlockProfile(resource_types=block_types) if block_requests else None,
+                               capture_network=capture_network, fast_path=fast_path, tracer=tracer,
+                               max_pages=max_pages, max_rss_mb=max_rss_mb, limits=limits,
+                               role_detail_tabs=role_detail_tabs, scrape_reviews=scrape_reviews,
+                               rate_limiter=rate_limiter)
+    try:
+        svc.ensure_login(email_id, password)
+    except Exception:
+        svc.close()
+        raise
+    print(f"[worker {worker_id}] Login successful.")
+    return svc
+
+
+def scrape_slug(svc: RepVueService, slug: str, **kwargs) -> dict:
+    """run_pool work for --catalog: open the slug directly; results are keyed by slug."""
+    return scrape_company(svc, slug, slug=slug, **kwargs)
+
+
+def report(res: dict) -> None:
+    company = res["company"]
+    if res["status"] == "OK":
+        print(f"✅ Scraped {company} in {res['seconds']}s, {res['wait_seconds']}s waiting (worker {res['worker']})")
+    elif res["status"] == "Unchanged":
+        print(f"⏭️  {company} unchanged since last run, skipped full scrape.")
+    elif res["status"] == "Not Found":
+        print(f"❌ Company '{company}' not found. Skipping.")
+    else:
+        print(f"⚠️  {company} failed: {res.get('error')}")
 
 
 # -------------------- MAIN --------------------
-try:
-    with RepVueService.create() as svc:
-        svc.driver.get("https://www.repvue.com/login")
-        svc.login(email_id, password)
-        print("Login successful.")
-
-        with pd.ExcelWriter(output_file, engine="openpyxl", mode="w") as writer:
-            wrote_any_sheet = False
-            summary_rows = []
-
-            for company in companies:
-                print(f"\n🔍 Processing {company}...")
-                start = time.time()
-
-                try:
-                    url = svc.search(company)
-                    print("Navigated to:", url)
-                except CompanyNotFound:
-                    print(f"❌ Company '{company}' not found. Skipping.")
-                    summary_rows.append({"company": company, "status": "Not Found"})
-                    continue
-
-                # Wait briefly for page load; replace with svc wait if available
-                time.sleep(2)
-
-                info = svc.general_info() or {}
-                perf = svc.performance() or {}
-
-                salaries = []
-                slug = svc.company_slug()
-                if slug:
-                    svc.go("salaries", slug)
-                    salaries = svc.salaries() or []
-
-                # Convert to DataFrames (tabular)
-                df_info = pd.DataFrame([info]) if info else pd.DataFrame()
-
-                # Flatten performance data: list[dict] → DataFrame
-                if isinstance(perf, list):
-                    df_perf = pd.DataFrame(perf)
-                elif isinstance(perf, dict):
-                    df_perf = pd.DataFrame([perf])
-                else:
-                    df_perf = pd.DataFrame()
-
-                # Flatten salaries if it's list-of-lists or list-of-dicts
-                if salaries:
-                    if isinstance(salaries[0], dict):
-                        df_salaries = pd.DataFrame(salaries)
-                    else:
-                        df_salaries = pd.DataFrame(salaries)
-                else:
-                    df_salaries = pd.DataFrame()
-
-
-                # Write to Excel sheets
-                if not df_info.empty:
-                    df_info.to_excel(writer, sheet_name=safe_sheet_name(company, "Info"), index=False)
-                    wrote_any_sheet = True
-                if not df_perf.empty:
-                    df_perf.to_excel(writer, sheet_name=safe_sheet_name(company, "Perf"), index=False)
-                    wrote_any_sheet = True
-                if not df_salaries.empty:
-                    df_salaries.to_excel(writer, sheet_name=safe_sheet_name(company, "Salaries"), index=False)
-                    wrote_any_sheet = True
-
-                summary_rows.append({
-                    "company": company,
-                    "url": svc.driver.current_url,
-                    "info_keys": len(df_info.columns),
-                    "perf_rows": len(df_perf),
-                    "salary_rows": len(df_salaries),
-                    "seconds": round(time.time() - start, 2),
-                })
-
-                print(f"✅ Saved {company} (Info/Perf/Salaries)")
-
-            # Fallback if nothing written
-            if not wrote_any_sheet:
-                pd.DataFrame({"Status": ["No valid data scraped"]}).to_excel(
-                    writer, sheet_name="Empty", index=False
-                )
-
-            # Add summary sheet
-            if summary_rows:
-                pd.DataFrame(summary_rows).to_excel(writer, sheet_name="Summary", index=False)
-
-        svc.driver.close()
-
-finally:
-    print(f"\n✅ Scraping complete. Data saved to {output_file}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape several RepVue companies in parallel.")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip companies already done/not-found in the manifest; retry failed ones")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="with --resume, give up on a company after this many failed attempts")
+    parser.add_argument("--force", action="store_true",
+                        help="full scrape of every company even if its content fingerprint is unchanged")
+    parser.add_argument("--catalog", help="scrape every company in a crawl_directory.py catalog instead of "
+                                          "the list above (slugs known up front: no searches)")
+    args = parser.parse_args()
+
+    if args.catalog:
+        # display names are not unique, so catalog runs are keyed (manifest, sink, sheets) by slug
+        companies = list(dict.fromkeys(e["slug"] for e in load_catalog(args.catalog) if e.get("slug")))
+
+    os.makedirs(sink_dir, exist_ok=True)
+    manifest = RunManifest(manifest_file)
+    fingerprints = FingerprintStore(fingerprint_file, max_age=fingerprint_max_age)
+    todo = manifest.start(companies, resume=args.resume, max_attempts=args.max_attempts)
+    print(f"🔍 Processing {len(todo)}/{len(companies)} companies with {workers} worker(s)...")
+    run_start = time.time()
+
+    with make_sink(sink_kind, sink_dir, fsync=sink_fsync) as sink:
+        # salary/review rows go to the sink as they load, the rest once the company is done
+        work = functools.partial(scrape_slug if args.catalog else scrape_company, fingerprints=fingerprints,
+                                 force=args.force, on_rows=sink.write_rows)
+
+        def on_result(i: int, res: dict) -> None:
+            sink.write(res)
+            manifest.mark(res)
+            report(res)
+
+        if todo:
+            try:
+                run_pool(todo, start_worker, work, workers=workers, on_result=on_result)
+            except NoWorkerStarted as e:
+                # the companies are already marked Failed in the sink and manifest
+                manifest.flush()
+                print(f"\n❌ {e}  {manifest.counts()}")
+                sys.exit(1)
+    fingerprints.flush()
+    manifest.flush()
+
+    print(f"\nTotal wall time: {round(time.time() - run_start, 2)}s  {manifest.counts()}")
+    if rate_limiter is not None:
+        print(f"Rate limiter: {rate_limiter.stats}, final rate {round(rate_limiter.rate, 2)}/s")
+
+    if tracer is not None:
+        os.makedirs(trace_dir, exist_ok=True)
+        tracer.export_jsonl(os.path.join(trace_dir, "trace.jsonl"))
+        tracer.export_prometheus(os.path.join(trace_dir, "metrics.prom"))
+        print(f"Trace written to {trace_dir}/")
+
+    # Build the workbook from what the sink persisted
+    n = finalize_excel(sink_dir, output_file, order=companies)
+    print(f"Wrote {n} companies to {output_file}")
+    print(f"\n✅ Scraping complete. Raw results in {sink_dir}/, workbook {output_file}")
@@ -1,11 +1,15 @@
 # service.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator
 
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 
 # use your existing driver factory
 from functions.make_driver import make_driver
@@ -15,61 +19,389 @@ from functions.login import login_repVue
 from functions.search_company import search_company
 from functions.company_url_path import extract_company_url
 from functions.navigate_link import navigation
-from functions.general_info import scrape_general_info
+from functions.general_info import scrape_general_info, REQUIRED_FIELDS
 from functions.performance_info import scrape_performance_table
 from functions.salaries_table import scrape_salaries_table
+from functions.salary_details import crawl_role_details
+from functions.incremental_list import iter_salaries, iter_reviews
+from functions.company_directory import crawl_directory
+from functions.readiness import wait_ready
+from functions.instrumentation import Tracer, traced, span, record_event
+from functions.driver_lifecycle import quit_driver, process_tree_rss_mb
+from functions.resource_guard import ResourceGuard, ResourceLimits
+from functions.rate_limit import RateLimiter
+from functions.request_blocking import BlockProfile, apply_blocking, page_weight
+from functions.http_client import BASE_URL, session_from_driver, fetch_payloads
+from functions.async_engine import scrape_many as async_scrape_many
+from functions.network_capture import (read_performance_log, capture_json, map_general_info, map_performance,
+                                       map_salaries, fill_missing)
+from functions.exceptions import CompanyNotFound
+from functions.slug_cache import SlugCache, shared_slug_cache
+from functions.session_store import DEFAULT_SESSION_FILE, restore_session, save_session, session_is_valid
 
 
 @dataclass
 class RepVueService:
     driver: WebDriver
     timeout: int = 20
+    slug_cache: Optional[SlugCache] = field(default_factory=shared_slug_cache)
+    block_profile: Optional[BlockProfile] = None
+    capture_network: bool = False        # fill gaps in the DOM data from the SPA's JSON responses
+    capture_dump_dir: Optional[str] = None
+    fast_path: bool = False              # try plain HTTP (browser cookies) before driving Chrome
+    tracer: Optional[Tracer] = None      # per-stage spans + WebDriver command counts
+    max_pages: Optional[int] = None      # recycle the browser after this many page loads
+    max_rss_mb: Optional[float] = None   # ... or once Chrome's process tree grows past this
+    limits: Optional[ResourceLimits] = None  # hard limits enforced by a watchdog thread
+    role_detail_tabs: int = 0            # >0: follow each salary row's link, this many tabs at a time
+    paginate_lists: bool = True          # salaries(): follow the list's "load more"/next control to the end
+    scrape_reviews: bool = False         # scrape_company(): also stream the reviews page
+    rate_limiter: Optional[RateLimiter] = None  # shared by all workers: paces page loads, backs off when throttled
 
     def __post_init__(self):
+        self.wait_seconds = 0.0  # total time spent in ready() by this service
+        self._net_log: List[Dict[str, Any]] = []   # CDP messages for the current page
+        self._captured = (0, [])                   # (len(_net_log) when parsed, payloads)
+        self._http = None                          # requests.Session for the fast path
+        self.pages_loaded = 0                      # since the current driver was started
+        self.recycles = 0
+        self._driver_kwargs: Dict[str, Any] = {"block_profile": self.block_profile,
+                                               "record_network": self.capture_network}
+        self._session: Optional[tuple] = None      # (email, password, session_file) once logged in
+        self.guard = ResourceGuard(self.limits, lambda: self.driver).start() if self.limits else None
+        self._attach()
+
+    def _attach(self) -> None:
+        """(Re)bind per-driver state after create() or recycle()."""
         self.wait = WebDriverWait(self.driver, self.timeout)
+        if self.tracer is not None:
+            self.tracer.instrument(self.driver)
+
+    def span(self, name: str, **attrs):
+        """Context manager for a custom stage (no-op without a tracer)."""
+        return span(self.tracer, name, **attrs)
+
+    def limited(self, what: str = "page", browser: bool = True):
+        """Take a rate-limiter token for one page load and report how it went (no-op without a limiter)."""
+        if self.rate_limiter is None:
+            return nullcontext({})
+        return self.rate_limiter.limit(self.driver if browser else None, what)
+
+    def ready(self, *signals: str, timeout: Optional[int] = None) -> float:
+        """
+        Wait until the data the next scraper needs is on the page
+        ('general_info', 'performance', 'salaries', 'network_idle'; any of them).
+        Returns the seconds actually waited.
+        """
+        signals = signals or ("network_idle",)
+        with self.span("ready", signals=",".join(signals)) as s:
+            ok, waited = wait_ready(self.driver, *signals,
+                                    timeout=self.timeout if timeout is None else timeout)
+            if s is not None:
+                s["attrs"]["ready"] = ok
+        self.wait_seconds += waited
+        return waited
 
     # ---- factory that uses your existing make_driver() ----
     @classmethod
-    def create(cls) -> "RepVueService":
-        """RepVueService.create(headless=True, browser='chrome', ...) -> service"""
-        drv = make_driver()
-        return cls(drv)
+    def create(cls, block_profile: Optional[BlockProfile] = None, capture_network: bool = False,
+               **kwargs) -> "RepVueService":
+        """RepVueService.create(block_profile=BlockProfile(), capture_network=True, ...) -> service"""
+        drv = make_driver(block_profile=block_profile, record_network=capture_network)
+        return cls(drv, block_profile=block_profile, capture_network=capture_network, **kwargs)
+
+    # ---- driver lifecycle ----
+    def rss_mb(self) -> float:
+        """Resident memory of chromedriver + all Chrome processes, in MB."""
+        return process_tree_rss_mb(self.driver)
+
+    def needs_recycle(self) -> Optional[str]:
+        if self.max_pages and self.pages_loaded >= self.max_pages:
+            return f"{self.pages_loaded} pages"
+        if self.max_rss_mb:
+            rss = self.rss_mb()
+            if rss > self.max_rss_mb:
+                return f"{rss} MB RSS"
+        return None
+
+    def maybe_recycle(self) -> bool:
+        """Recycle if over max_pages/max_rss_mb; call between companies."""
+        reason = self.needs_recycle()
+        if reason:
+            self.recycle(reason)
+        return bool(reason)
+
+    @traced("recycle")
+    def recycle(self, reason: str = "manual") -> None:
+        """
+        Replace the browser with a fresh one (old profile dir removed) and carry the
+        logged-in session over; logs in again only if the saved session is gone.
+        """
+        quit_driver(self.driver)
+        self.driver = make_driver(**self._driver_kwargs)
+        self._attach()
+        if self.guard is not None:
+            self.guard.reset()
+        self.pages_loaded = 0
+        self.recycles += 1
+        self._net_log, self._captured = [], (0, [])
+        if self._session:
+            self.ensure_login(*self._session)
+
+    # ---- network log (block profile reporting / capture mode) ----
+    @property
+    def records_network(self) -> bool:
+        return bool(self.capture_network or (self.block_profile and self.block_profile.record))
+
+    def _drain_log(self) -> None:
+        if self.records_network:
+            self._net_log.extend(read_performance_log(self.driver))
+
+    def _prepare_tab(self) -> None:
+        """Repeat the main tab's CDP setup (block list, network recording) on a newly opened tab."""
+        if self.block_profile is not None:
+            apply_blocking(self.driver, self.block_profile)
+        elif self.records_network:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+
+    def _new_page(self) -> None:
+        """Forget network traffic of the previous page (called before each navigation)."""
+        self.pages_loaded += 1
+        self._drain_log()
+        self._net_log = []
+        self._captured = (0, [])
+
+    def page_weight(self) -> Dict[str, Any]:
+        """Requests/bytes (and blocked requests) on this page since the previous call; needs a recording driver."""
+        self._drain_log()
+        weight = page_weight(self.driver, self._net_log)
+        self._net_log, self._captured = [], (0, [])
+        return weight
+
+    def captured_json(self) -> List[Dict[str, Any]]:
+        """JSON responses the SPA fetched for the current page: [{url, status, body}]."""
+        self._drain_log()
+        n, payloads = self._captured
+        if n != len(self._net_log):
+            payloads = payloads + capture_json(self.driver, self._net_log[n:], dump_dir=self.capture_dump_dir)
+            self._captured = (len(self._net_log), payloads)
+        return payloads
 
     # ---- high-level actions ----
+    @traced("login")
     def login(self, email: str, password: str) -> str:
         return login_repVue(self.driver, email, password, timeout=self.timeout)
 
+    @traced("ensure_login")
+    def ensure_login(self, email: str, password: str, session_file: Optional[str] = DEFAULT_SESSION_FILE) -> str:
+        """Reuse a saved session if it is still valid; otherwise log in and save the new one."""
+        self._session = (email, password, session_file)
+        if session_file and restore_session(self.driver, session_file) and session_is_valid(self.driver):
+            return self.driver.current_url
+        url = self.login(email, password)
+        if session_file:
+            save_session(self.driver, session_file)
+        return url
+
+    @traced("search")
     def search(self, company_name: str, timeout: Optional[int] = None) -> str:
+        """Resolve via the slug cache when possible; the search dialog only runs on a cache miss."""
+        if self.slug_cache is not None:
+            hit, slug = self.slug_cache.lookup(company_name)
+            if hit and slug is None:
+                raise CompanyNotFound(f"Company not found on RepVue: {company_name} (cached)")
+            if hit:
+                try:
+                    return self.open_company(slug)
+                except WebDriverException as e:
+                    # stale slug (company renamed/removed): forget it and search again
+                    record_event("stale_slug", company=company_name, slug=slug, error=type(e).__name__)
+                    self.slug_cache.invalidate(company_name)
+
+        self._new_page()
         w = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
-        url = search_company(self.driver, w, company_name)
+        try:
+            with self.limited("search") as load:
+                url = search_company(self.driver, w, company_name, load=load)
+        except CompanyNotFound:
+            if self.slug_cache is not None:
+                self.slug_cache.put_missing(company_name)
+            raise
+        if self.slug_cache is not None:
+            slug = self.company_slug()
+            if slug:
+                self.slug_cache.put(company_name, slug)
         return url
 
+    @traced("open_company")
+    def open_company(self, slug: str) -> str:
+        """Go straight to https://www.repvue.com/companies/<slug>."""
+        self._new_page()
+        with self.limited("open_company") as load:
+            start = time.monotonic()
+            self.driver.get(f"https://www.repvue.com/companies/{slug}")
+            load["seconds"] = time.monotonic() - start
+            self.wait.until(EC.url_contains(f"/companies/{slug}"))
+        return self.driver.current_url
+
+    @traced("directory")
+    def directory(self, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Load /companies and return a generator over every listed company (see functions.company_directory)."""
+        self._new_page()
+        with self.limited("directory"):
+            self.driver.get(f"{BASE_URL}/companies")
+        self.ready("network_idle")
+        return crawl_directory(self.driver, limiter=self.rate_limiter, **kwargs)
+
+    def resolve_slug(self, company_name: str) -> str:
+        """Slug for a company name; only touches the browser on a slug-cache miss."""
+        if self.slug_cache is not None:
+            hit, slug = self.slug_cache.lookup(company_name)
+            if hit and slug is None:
+                raise CompanyNotFound(f"Company not found on RepVue: {company_name} (cached)")
+            if hit:
+                return slug
+        self.search(company_name)
+        slug = self.company_slug()
+        if not slug:
+            raise CompanyNotFound(f"No company slug in URL after searching: {company_name}")
+        return slug
+
     def company_slug(self) -> Optional[str]:
         return extract_company_url(self.driver)
 
+    @traced("navigation")
     def go(self, page: str = None, company: Optional[str] = None) -> None:
         """page: 'salaries', 'reviews', etc. company is slug; if None, inferred from URL."""
         slug = company or self.company_slug()
         if not slug:
             raise RuntimeError("No company slug found. Run search() first or pass company='Slug'.")
-        navigation(self.driver, self.wait, slug, page)
+        self._new_page()
+        with self.limited("navigation") as load:
+            navigation(self.driver, self.wait, slug, page, load=load)
 
     # ---- scrapers ----
+    # In capture mode the JSON the page already fetched is read first (mapped only
+    # when it belongs to this company's slug, see functions.network_capture); the DOM
+    # is scraped only when that data is missing or incomplete, so no selector wait
+    # is paid for data the page already delivered.
+    @traced("general_info")
     def general_info(self) -> Dict[str, Any]:
-        return scrape_general_info(self.driver, self.wait)
+        if not self.capture_network:
+            return scrape_general_info(self.driver, self.wait)
+        mapped = map_general_info(self.captured_json(), self.company_slug())
+        if mapped and all(mapped.get(k) is not None for k in REQUIRED_FIELDS):
+            return mapped
+        return fill_missing(scrape_general_info(self.driver, self.wait), mapped)
 
-    def performance(self) -> Dict[str, Any]:
-        return scrape_performance_table(self.driver, self.wait)
+    @traced("performance")
+    def performance(self, batched: bool = True) -> List[Dict[str, Any]]:
+        """batched=False switches to the per-cell Selenium scraper (for comparing results)."""
+        if self.capture_network:
+            rows = map_performance(self.captured_json(), self.company_slug())
+            if rows:
+                return rows
+        return scrape_performance_table(self.driver, self.wait, batched=batched, timeout=self.timeout)
 
+    @traced("salaries")
     def salaries(self) -> List[Dict[str, Any]]:
-        return scrape_salaries_table(self.driver, self.wait)
+        if self.paginate_lists:
+            return list(self.iter_salaries())
+        rows = map_salaries(self.captured_json(), self.company_slug()) if self.capture_network else None
+        return rows or scrape_salaries_table(self.driver, self.wait)
 
-    # ---- lifecycle ----
-    def close(self):
+    def iter_salaries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Salary rows as they load (call after go('salaries') + ready('salaries')). In capture
+        mode the captured rows come first; the DOM list then only adds rows (later pages)
+        the JSON did not carry.
+        """
+        seen = set()
+        if self.capture_network:
+            for row in map_salaries(self.captured_json(), self.company_slug()) or []:
+                if row.get("link"):
+                    seen.add(row["link"].rstrip("/"))
+                yield row
+        for row in iter_salaries(self.driver, limiter=self.rate_limiter):
+            if (row.get("link") or "").rstrip("/") not in seen:
+                yield row
+
+    def iter_reviews(self) -> Iterator[Dict[str, Any]]:
+        """Review dicts as they load (call after go('reviews'))."""
+        return iter_reviews(self.driver, limiter=self.rate_limiter)
+
+    @traced("salary_details")
+    def salary_details(self, rows: List[Dict[str, Any]], tabs: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Attach row['detail'] from each role's /salaries/<role> page, loaded in parallel tabs."""
+        rows = crawl_role_details(self.driver, rows, tabs=tabs or self.role_detail_tabs or 4,
+                                  timeout=self.timeout, on_new_tab=self._prepare_tab,
+                                  limiter=self.rate_limiter)
+        self.pages_loaded += sum(1 for r in rows if r.get("link"))
+        return rows
+
+    # ---- browserless fast path ----
+    def http(self):
+        """Pooled keep-alive session carrying this browser's (logged-in) cookies."""
+        if self._http is None:
+            self._http = session_from_driver(self.driver)
+        return self._http
+
+    @traced("scrape_fast")
+    def scrape_fast(self, slug: str) -> Dict[str, Any]:
+        """
+        Scrape a company over HTTP from the pages' embedded data; any part the fast
+        path can't parse, or that lacks required fields (info without every
+        REQUIRED_FIELDS value, empty perf/salaries), is scraped with Selenium instead.
+        Returns {info, perf, salaries, fast: [parts served over HTTP]}.
+        """
         try:
-            self.driver.quit()
+            with self.limited("http", browser=False):
+                overview = fetch_payloads(self.http(), f"{BASE_URL}/companies/{slug}") or []
+            with self.limited("http", browser=False):
+                salaries_page = fetch_payloads(self.http(), f"{BASE_URL}/companies/{slug}/salaries") or []
         except Exception:
-            pass
+            overview, salaries_page = [], []
+
+        mapped_info = map_general_info(overview, slug)
+        out = {
+            "info": mapped_info if mapped_info and all(mapped_info.get(k) is not None for k in REQUIRED_FIELDS) else None,
+            "perf": map_performance(overview, slug),
+            "salaries": map_salaries(salaries_page, slug),
+        }
+        out["fast"] = [k for k, v in out.items() if v is not None]
+
+        if out["info"] is None or out["perf"] is None:
+            self.open_company(slug)
+            self.ready("general_info", "performance")
+            if out["info"] is None:
+                out["info"] = fill_missing(self.general_info(), mapped_info)
+            if out["perf"] is None:
+                out["perf"] = self.performance()
+        if out["salaries"] is None:
+            self.go("salaries", slug)
+            self.ready("salaries")
+            out["salaries"] = self.salaries()
+        return out
+
+    async def scrape_many(self, slugs: List[str], **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        `async for res in svc.scrape_many(slugs): ...` -- concurrent HTTP scrape of many
+        slugs with this browser's cookies, yielded as they complete (see functions.async_engine).
+        Parts listed in res['missing'] still need a scrape_fast()/Selenium pass.
+        """
+        cookies = {c["name"]: c["value"] for c in self.driver.get_cookies()}
+        headers = {"User-Agent": self.driver.execute_script("return navigator.userAgent;")}
+        kwargs.setdefault("limiter", self.rate_limiter)
+        async for res in async_scrape_many(slugs, cookies, headers, **kwargs):
+            yield res
+
+    # ---- lifecycle ----
+    def close(self):
+        if self.guard is not None:
+            self.guard.stop()
+        if self._http is not None:
+            self._http.close()
+        quit_driver(self.driver)
 
     def __enter__(self) -> "RepVueService":
         return self
@@ -0,0 +1,49 @@
+from concurrent.futures import Future
+
+from api import create_app
+from functions.result_cache import ResultCache
+
+
+class FakePool:
+    workers = 1
+    ready = {0: True}
+
+    def __init__(self):
+        self.scraped = []
+
+    def submit(self, item):
+        self.scraped.append(item)
+        fut = Future()
+        fut.set_result({"company": item[0], "slug": item[1], "status": "OK"})
+        return fut
+
+    def pending(self):
+        return 0
+
+
+def _client(token="secret"):
+    pool = FakePool()
+    return create_app(pool=pool, cache=ResultCache(), token=token).test_client(), pool
+
+
+def test_requests_need_the_token():
+    client, pool = _client()
+    assert client.get("/companies/acme").status_code == 401
+    assert client.get("/companies/acme", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/companies/acme", headers={"Authorization": "Bearer secret"}).status_code == 200
+    assert client.get("/health").status_code == 200
+    assert pool.scraped == [("acme", "acme")]
+
+
+def test_refresh_of_a_fresh_result_is_served_from_cache():
+    client, pool = _client(token=None)
+    assert client.get("/companies/acme").status_code == 200
+    res = client.get("/companies/acme?refresh=1").get_json()
+    assert res["source"] == "cache"
+    assert len(pool.scraped) == 1
+
+
+def test_no_cors_headers_by_default():
+    client, _ = _client(token=None)
+    res = client.get("/health", headers={"Origin": "https://evil.example"})
+    assert "Access-Control-Allow-Origin" not in res.headers
@@ -0,0 +1,52 @@
+import json
+import time
+
+from functions.fingerprint import FingerprintStore, SqliteFingerprintStore, fingerprint
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_unchanged_needs_a_full_pass(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fp.json"))
+    assert not store.unchanged("acme", "summary", {"score": 80})
+    store.update("acme", summary={"score": 80}, perf=[1])
+    assert store.unchanged("acme", "summary", {"score": 80})
+    assert not store.unchanged("acme", "summary", {"score": 81})
+
+
+def test_update_returns_changed_pages(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fp.json"))
+    assert sorted(store.update("acme", summary={"score": 80}, perf=[1])) == ["perf", "summary"]
+    assert store.update("acme", summary={"score": 80}, perf=[2]) == ["perf"]
+
+
+def test_full_pass_older_than_max_age_is_never_unchanged(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fp.json"), max_age=60)
+    store.update("acme", summary={"score": 80}, perf=[1])
+    store._data["acme"]["full_at"] = time.time() - 120
+    assert not store.unchanged("acme", "summary", {"score": 80})
+
+
+def test_saves_are_batched_until_flush(tmp_path):
+    path = tmp_path / "fp.json"
+    store = FingerprintStore(str(path), save_every=3600)
+    store.update("acme", summary={"score": 80}, perf=[1])
+    assert not path.exists()
+    store.flush()
+    assert "acme" in json.loads(path.read_text())
+    assert FingerprintStore(str(path)).unchanged("acme", "summary", {"score": 80})
+
+
+def test_sqlite_store_keeps_concurrent_writers_apart(tmp_path):
+    path = str(tmp_path / "repvue.db")
+    a = SqliteFingerprintStore(path)
+    b = SqliteFingerprintStore(path)
+    a.update("acme", summary={"score": 80}, perf=[1])
+    b.update("globex", summary={"score": 50}, perf=[2])
+    assert a.unchanged("globex", "summary", {"score": 50})
+    assert b.unchanged("acme", "summary", {"score": 80})
+    assert b.update("acme", summary={"score": 80}, perf=[3]) == ["perf"]
+    assert not a.unchanged("acme", "summary", {"score": 81})
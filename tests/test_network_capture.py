@@ -0,0 +1,52 @@
+from functions.network_capture import fill_missing, map_general_info, map_performance, map_salaries
+
+
+def _payload(body, url="https://api.repvue.com/v1/companies"):
+    return {"url": url, "body": body}
+
+
+ACME = {"slug": "acme", "repvue_score": "81.5", "averageRating": 4.2, "ratings_count": "1,204",
+        "employee_count": 900}
+
+
+def test_general_info_picks_the_requested_company():
+    other = {**ACME, "slug": "globex", "repvue_score": 50}
+    info = map_general_info([_payload({"companies": [other, ACME]})], "acme")
+    assert info == {"RepVue score": 81.5, "star_rating": 4.2, "Employee ratings (N)": 1204,
+                    "current_size": 900, "trend_pct": None}
+
+
+def test_general_info_needs_a_score():
+    body = {"slug": "acme", "averageRating": 4.2, "employee_count": 900}
+    assert map_general_info([_payload(body)], "acme") is None
+    assert map_general_info([_payload(ACME)], None) is None
+
+
+def test_performance_rows_scoped_to_slug():
+    rows = [{"category": "Culture", "score": 80, "industry_percentile": 90, "industry_rank": 3}]
+    other = [{"category": "Culture", "score": 10, "industry_percentile": 5}] * 3
+    body = {"company": {"slug": "acme", "categories": rows}, "peer": {"slug": "globex", "categories": other}}
+    assert map_performance([_payload(body)], "acme") == [
+        {"category": "Culture", "score": 80.0, "industry_percentile": 90.0, "industry_rank": 3}]
+
+
+def test_unscoped_rows_need_the_slug_in_the_url():
+    rows = [{"category": "Culture", "score": 80, "industry_percentile": 90}]
+    assert map_performance([_payload(rows, "https://api.repvue.com/v1/companies/acme/scores")], "acme")
+    assert map_performance([_payload(rows, "https://api.repvue.com/v1/companies/acmecorp/scores")], "acme") is None
+
+
+def test_salaries_rows_and_links():
+    rows = [{"role_name": "Account Executive", "median_base_pay": "$85,000", "ote": 170000, "slug": "account-executive"},
+            {"role_name": None, "median_base_pay": 1}]
+    [row] = map_salaries([_payload({"slug": "acme", "salaries": rows})], "acme")
+    assert row["role"] == "Account Executive"
+    assert row["median_base_pay"] == row["median_base_pay_min"] == 85000
+    assert row["median_ote"] == 170000 and row["median_ote_is_range"] is False
+    assert row["link"] == "https://www.repvue.com/companies/acme/salaries/account-executive"
+
+
+def test_fill_missing_only_fills_none():
+    scraped = {"RepVue score": 80, "current_size": None}
+    assert fill_missing(scraped, {"RepVue score": 10, "current_size": 900}) == {"RepVue score": 80, "current_size": 900}
+    assert fill_missing(scraped, None) is scraped
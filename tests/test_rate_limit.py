@@ -0,0 +1,97 @@
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from functions.rate_limit import RateLimiter, throttle_signal
+
+
+class FakeDriver:
+    def __init__(self, url="https://www.repvue.com/companies/acme", title="Acme", state="complete"):
+        self.current_url, self.title, self.state = url, title, state
+
+    def execute_script(self, script):
+        return self.state
+
+
+class HTTPError(Exception):
+    def __init__(self, status):
+        self.response = type("Response", (), {"status_code": status})()
+
+
+class ReadTimeout(Exception):
+    pass
+
+
+def test_throttle_signal():
+    assert throttle_signal(status=429) == "http 429"
+    assert throttle_signal(error=HTTPError(503)) == "http 503"
+    assert throttle_signal(error=HTTPError(404)) is None
+    assert throttle_signal(error=ReadTimeout()) == "timeout"
+    assert throttle_signal(FakeDriver(url="https://www.repvue.com/login")) == "login redirect"
+    assert throttle_signal(FakeDriver(title="Too Many Requests")) == "error page"
+    assert throttle_signal(FakeDriver(), seconds=20, slow_seconds=12) == "slow"
+    assert throttle_signal(FakeDriver(), seconds=2, slow_seconds=12) is None
+
+
+def test_wait_timeout_on_loaded_page_is_not_throttling():
+    assert throttle_signal(FakeDriver(), error=TimeoutException()) is None
+    assert throttle_signal(FakeDriver(state="loading"), error=TimeoutException()) == "timeout"
+
+
+def test_report_backs_off_and_recovers():
+    rl = RateLimiter(rate=1.0, backoff=0.5, step=0.1, recover_after=2, cooldown=0)
+    rl.report("http 429")
+    assert rl.rate == pytest.approx(0.5)
+    rl.report()
+    rl.report()
+    assert rl.rate == pytest.approx(0.6)
+    assert rl.stats["reasons"] == {"http 429": 1}
+
+
+def test_rate_never_drops_below_min():
+    rl = RateLimiter(rate=0.1, min_rate=0.08, cooldown=0)
+    rl.report("slow")
+    assert rl.rate == pytest.approx(0.08)
+
+
+def test_acquire_uses_burst_without_waiting():
+    rl = RateLimiter(rate=0.01, burst=2)
+    assert rl.acquire() < 0.5
+    assert rl.acquire() < 0.5
+    assert rl._take() > 0
+
+
+def test_limit_reports_exceptions_and_reraises():
+    rl = RateLimiter(cooldown=0)
+    with pytest.raises(HTTPError):
+        with rl.limit():
+            raise HTTPError(429)
+    assert rl.stats["throttled"] == 1
+
+
+def test_state_file_is_shared(tmp_path):
+    path = str(tmp_path / "rate")
+    a = RateLimiter(rate=1.0, cooldown=0, state_file=path)
+    b = RateLimiter(rate=1.0, cooldown=0, state_file=path)
+    a.report("http 429")
+    assert b.rate == pytest.approx(0.5)
+
+
+def test_reports_during_the_pause_count_as_one_incident():
+    rl = RateLimiter(rate=1.0, backoff=0.5, cooldown=5.0)
+    for _ in range(4):
+        rl.report("http 429")
+    assert rl.rate == pytest.approx(0.5)
+    assert rl._state["strikes"] == 1
+
+
+def test_slow_signal_uses_the_page_load_time_when_given():
+    rl = RateLimiter(slow_seconds=0.01, cooldown=0)
+    with rl.limit(FakeDriver()) as load:
+        time.sleep(0.05)          # e.g. a fallback wait for a missing element
+        load["seconds"] = 0.001
+    assert rl.stats["throttled"] == 0
+    with rl.limit(FakeDriver()):
+        time.sleep(0.05)
+    assert rl.stats["reasons"] == {"slow": 1}
@@ -0,0 +1,71 @@
+from functions.sinks import JsonlSink, load_results
+
+
+def _result(status, ts, score=None, salaries=()):
+    return {
+        "company": "Acme",
+        "slug": "acme",
+        "status": status,
+        "scraped_at": ts,
+        "info": {"RepVue score": score} if score is not None else {},
+        "perf": [{"category": "Culture", "score": score}] if score is not None else [],
+        "salaries": [{"role": r} for r in salaries],
+    }
+
+
+def _load(tmp_path, *results):
+    with JsonlSink(str(tmp_path)) as sink:
+        for r in results:
+            sink.write(r)
+    return load_results(str(tmp_path))
+
+
+def test_unchanged_after_failed_keeps_last_ok_data(tmp_path):
+    [res] = _load(tmp_path,
+                  _result("OK", "2024-01-01T00:00:00", 80, ["AE"]),
+                  _result("Failed", "2024-01-02T00:00:00"),
+                  _result("Unchanged", "2024-01-03T00:00:00"))
+    assert res["status"] == "Unchanged"
+    assert res["info"] == {"RepVue score": 80}
+    assert res["perf"] == [{"category": "Culture", "score": 80}]
+    assert res["salaries"] == [{"role": "AE"}]
+
+
+def test_failed_after_ok_does_not_wipe_data(tmp_path):
+    [res] = _load(tmp_path,
+                  _result("OK", "2024-01-01T00:00:00", 80, ["AE"]),
+                  _result("Failed", "2024-01-02T00:00:00"))
+    assert res["status"] == "Failed"
+    assert res["info"] == {"RepVue score": 80}
+    assert res["salaries"] == [{"role": "AE"}]
+
+
+def test_latest_ok_wins(tmp_path):
+    [res] = _load(tmp_path,
+                  _result("OK", "2024-01-01T00:00:00", 80, ["AE"]),
+                  _result("OK", "2024-01-02T00:00:00", 85, ["SDR"]))
+    assert res["info"] == {"RepVue score": 85}
+    assert res["salaries"] == [{"role": "SDR"}]
+
+
+def test_order(tmp_path):
+    results = _load(tmp_path,
+                    {**_result("OK", "2024-01-01T00:00:00", 80), "company": "B"},
+                    {**_result("OK", "2024-01-01T00:00:00", 70), "company": "A"})
+    assert [r["company"] for r in load_results(str(tmp_path), order=["A", "B"])] == ["A", "B"]
+    assert [r["company"] for r in results] == ["B", "A"]
+
+
+def test_sqlite_history_skips_rows_streamed_by_failed_attempts(tmp_path):
+    from functions.sqlite_store import DB_NAME, SqliteSink, connect, role_salaries
+
+    meta = {"company": "Acme", "slug": "acme"}
+    with SqliteSink(str(tmp_path)) as sink:
+        sink.write_rows("salaries", {**meta, "scraped_at": "2024-01-01T00:00:00"}, [{"role": "AE", "link": "/ae"}])
+        sink.write(_result("Failed", "2024-01-01T00:00:00"))
+        sink.write_rows("salaries", {**meta, "scraped_at": "2024-01-02T00:00:00"}, [{"role": "AE", "link": "/ae"}])
+        sink.write_rows("salaries", {**meta, "scraped_at": "2024-01-03T00:00:00"}, [{"role": "AE", "link": "/ae"}])
+        sink.write(_result("OK", "2024-01-03T00:00:00", 80))
+    db = connect(str(tmp_path / DB_NAME))
+    assert list(role_salaries(db, "AE")["scraped_at"]) == ["2024-01-03T00:00:00"]
+    db.close()
@@ -0,0 +1,70 @@
+import time
+
+from functions.work_queue import SqliteQueue, make_queue
+
+
+def _queue(tmp_path, **kwargs):
+    return SqliteQueue(str(tmp_path / "queue.db"), **kwargs)
+
+
+def test_lease_hands_each_item_out_once(tmp_path):
+    q = _queue(tmp_path)
+    q.put(["a", "b", "a"])
+    first = q.lease("n1", 5)
+    assert [item for _, _, item, _ in first] == ["a", "b"]
+    assert q.lease("n2", 5) == []
+
+
+def test_ack_final_status_is_done(tmp_path):
+    q = _queue(tmp_path)
+    q.put(["a"])
+    [(job_id, token, _, attempt)] = q.lease("n1")
+    assert attempt == 1
+    assert q.ack(job_id, token, "OK")
+    assert q.counts() == {"done": 1}
+    assert q.drained()
+
+
+def test_ack_failure_retries_then_fails(tmp_path):
+    q = _queue(tmp_path, max_attempts=2)
+    q.put(["a"])
+    for attempt in (1, 2):
+        [(job_id, token, _, n)] = q.lease("n1")
+        assert n == attempt
+        q.ack(job_id, token, "Failed", "boom")
+    assert q.counts() == {"failed": 1}
+
+
+def test_expired_lease_is_reclaimed_and_old_token_rejected(tmp_path):
+    q = _queue(tmp_path)
+    q.put(["a"])
+    [(job_id, old, _, _)] = q.lease("n1", visibility=0)
+    time.sleep(0.01)
+    [(same_id, new, _, attempt)] = q.lease("n2")
+    assert same_id == job_id and attempt == 2
+    assert not q.extend(job_id, old)
+    assert not q.ack(job_id, old, "OK")
+    assert q.ack(job_id, new, "OK")
+
+
+def test_expired_past_max_attempts_goes_dead(tmp_path):
+    q = _queue(tmp_path, max_attempts=1)
+    q.put(["a"])
+    q.lease("n1", visibility=0)
+    time.sleep(0.01)
+    assert q.lease("n2") == []
+    assert q.counts() == {"dead": 1}
+
+
+def test_release_makes_item_available_after_delay(tmp_path):
+    q = _queue(tmp_path)
+    q.put(["a"])
+    [(job_id, token, _, _)] = q.lease("n1")
+    assert q.release(job_id, token, delay=60)
+    assert q.lease("n1") == []
+    assert not q.drained()
+
+
+def test_make_queue_accepts_url_or_path(tmp_path):
+    assert isinstance(make_queue(f"sqlite://{tmp_path / 'a.db'}"), SqliteQueue)
+    assert isinstance(make_queue(str(tmp_path / "b.db")), SqliteQueue)
@@ -0,0 +1,53 @@
+import pytest
+
+from functions.exceptions import NoWorkerStarted
+from functions.worker_pool import run_pool
+
+
+class FakeService:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_results_in_item_order_and_reported():
+    seen = []
+    results = run_pool(["a", "b", "c"], lambda w: FakeService(), lambda svc, item: {"company": item, "status": "OK"},
+                       workers=2, on_result=lambda i, res: seen.append(res["company"]))
+    assert [r["company"] for r in results] == ["a", "b", "c"]
+    assert sorted(seen) == ["a", "b", "c"]
+
+
+def test_requeue_gives_up_after_max_requeues():
+    calls = []
+
+    def work(svc, item):
+        calls.append(item)
+        return {"company": item, "status": "Requeue"}
+
+    [res] = run_pool(["a"], lambda w: FakeService(), work, workers=1, max_requeues=2)
+    assert res["status"] == "Failed"
+    assert len(calls) == 3
+
+
+def test_items_left_by_a_dead_worker_are_reported():
+    def work(svc, item):
+        raise RuntimeError("chrome died")
+
+    seen = []
+    results = run_pool(["a", "b"], lambda w: FakeService(), work, workers=1,
+                       on_result=lambda i, res: seen.append((res["company"], res["status"])))
+    assert [r["status"] for r in results] == ["Failed", "Failed"]
+    assert sorted(seen) == [("a", "Failed"), ("b", "Failed")]
+
+
+def test_no_worker_started_reports_items_then_raises():
+    def init(worker_id):
+        raise RuntimeError("login failed")
+
+    seen = []
+    with pytest.raises(NoWorkerStarted):
+        run_pool(["a", "b"], init, None, workers=2, on_result=lambda i, res: seen.append(res["company"]))
+    assert sorted(seen) == ["a", "b"]